@@ -1,20 +1,15 @@
 # economic_data/db/create_db.py
 
-import os
-from sqlalchemy import create_engine
 from economic_data.db.schema import Base
+from economic_data.db.session import create_db_engine, get_db_url
 
 
-def create_database():
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    os.makedirs(current_dir, exist_ok=True)  # Ensure db folder exists
-
-    db_file = os.path.join(current_dir, "economic_data.sqlite")
-    db_url = f"sqlite:///{db_file}"
-
-    engine = create_engine(db_url)
+def create_database(db_url=None):
+    db_url = db_url or get_db_url()
+    engine = create_db_engine(db_url)
     Base.metadata.create_all(engine)
-    print(f"Database created at: {db_file}")
+    engine.dispose()
+    print(f"Database created at: {db_url}")
 
 
 if __name__ == "__main__":
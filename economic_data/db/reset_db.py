@@ -2,15 +2,19 @@
 
 import os
 from economic_data.db.create_db import create_database
+from economic_data.db.session import get_sqlite_path
 
 
-def remove_database():
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    db_file = os.path.join(current_dir, "economic_data.sqlite")
+def remove_database(db_url=None):
+    db_file = get_sqlite_path(db_url)
+    if db_file is None:
+        return
 
-    if os.path.exists(db_file):
-        os.remove(db_file)
-        print(f"Deleted existing database: {db_file}")
+    # WAL mode keeps the write-ahead log and shared memory index next to the file
+    for path in (db_file, f"{db_file}-wal", f"{db_file}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+            print(f"Deleted existing database: {path}")
 
 
 # def reset_database():
@@ -1,7 +1,121 @@
-from sqlalchemy import create_engine
+# economic_data/db/session.py
+import configparser
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
-DB_PATH = "economic_data/db/economic_data.sqlite"
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=False)
+CONFIG = "config/config.ini"
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_URL = f"sqlite:///{os.path.join(DB_DIR, 'economic_data.sqlite')}"
+
+# SQLite pragmas applied to every new connection, per engine profile.
+# WAL lets dashboard readers query while the nightly load writes, and
+# synchronous=NORMAL only fsyncs at checkpoints instead of on every commit.
+ENGINE_PROFILES = {
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,  # negative = KiB, i.e. 64 MB page cache
+        "mmap_size": 268435456,  # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,  # ms to wait for a lock before failing
+    },
+    "bulk_load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    "reader": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "query_only": "ON",
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+}
+
+
+def _read_config():
+    config = configparser.ConfigParser()
+    config.read(CONFIG)
+    return config
+
+
+def get_db_url():
+    """
+    Returns the database URL from the ECONOMIC_DATA_DB_URL environment variable,
+    else from [DATABASE] URL in the config file, else the SQLite file in this folder.
+    """
+    return os.environ.get("ECONOMIC_DATA_DB_URL") or _read_config().get(
+        "DATABASE", "URL", fallback=DEFAULT_DB_URL
+    )
+
+
+def get_db_profile():
+    """
+    Returns the engine profile name from the ECONOMIC_DATA_DB_PROFILE environment
+    variable, else from [DATABASE] PROFILE in the config file, else "default".
+    """
+    return os.environ.get("ECONOMIC_DATA_DB_PROFILE") or _read_config().get(
+        "DATABASE", "PROFILE", fallback="default"
+    )
+
+
+def get_sqlite_path(db_url=None):
+    """Returns the file path of a SQLite URL, or None for other or in-memory databases."""
+    url = make_url(db_url or get_db_url())
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return url.database
+
+
+def create_db_engine(db_url=None, profile=None, echo=False):
+    """
+    Creates an engine for `db_url` with the pragmas of the given profile applied
+    through a connect event. Non-SQLite URLs get a plain engine.
+
+    Parameters:
+    - db_url: Database URL. Defaults to get_db_url().
+    - profile: Name of an ENGINE_PROFILES entry. Defaults to get_db_profile().
+    - echo: Passed on to create_engine.
+    Returns:
+    - sqlalchemy.engine.Engine
+    """
+    db_url = db_url or get_db_url()
+    profile = profile or get_db_profile()
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown database profile: {profile}")
+
+    sqlite_path = get_sqlite_path(db_url)
+    if sqlite_path:
+        os.makedirs(os.path.dirname(os.path.abspath(sqlite_path)), exist_ok=True)
+
+    engine = create_engine(db_url, echo=echo)
+    if engine.dialect.name == "sqlite":
+        pragmas = ENGINE_PROFILES[profile]
+
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
+
+
+engine = create_db_engine()
 
 Session = sessionmaker(bind=engine)
@@ -2,21 +2,73 @@ import pandas as pd
 import requests
 import json
 import logging
-
-import gspread
+import queue
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from economic_data.extract.http_client import TokenBucket, get_http_client
+from economic_data.extract.response_cache import (
+    get_response_cache,
+    normalize_cache_key,
+)
+from economic_data.extract.sheets_client import (
+    CONTROL_SHEET,
+    OUTPUT_SHEET,
+    SHEETS_REQUESTS_PER_MINUTE,
+    SheetClient,
+    get_gspread_client,
+    get_sheet_client,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_json(url, headers=None):
+def fetch_json(url, headers=None, cache=None):
     """
     Generic helper to fetch JSON data from a URL with error handling.
+    Requests go through the shared pooled client, which applies timeouts,
+    retries and per-host rate limits.
+
+    If a ResponseCache is given (or set process-wide with set_response_cache),
+    the request is made conditional with If-None-Match / If-Modified-Since and
+    a 304 response is served from the cache. In offline mode only the cache
+    is consulted.
     Returns the parsed JSON or None if there was an error.
     """
+    cache = cache if cache is not None else get_response_cache()
+    key = normalize_cache_key(url) if cache is not None else None
+    entry = cache.get(key) if cache is not None else None
+
+    if cache is not None and cache.offline:
+        if entry is None:
+            logger.error(f"Offline mode: no cached response for {key}")
+            return None
+        logger.info(f"Offline mode: serving {key} from cache")
+        return json.loads(entry["body"])
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry["etag"]:
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
     try:
-        response = requests.get(url, headers=headers)
+        response = get_http_client().get(url, headers=request_headers)
+        if response.status_code == 304 and entry is not None:
+            logger.info(f"Not modified, serving {key} from cache")
+            cache.touch(key)
+            return json.loads(entry["body"])
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        if cache is not None:
+            cache.put(
+                key,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return data
     except requests.exceptions.RequestException as e:
         logger.error(f"Request error for {url}: {e}")
         return None
@@ -25,6 +77,50 @@ def fetch_json(url, headers=None):
         return None
 
 
+def fetch_concurrently(tasks, max_workers=4):
+    """
+    Runs independent fetch calls concurrently in a thread pool.
+
+    Parameters:
+    ----------
+    tasks : dict
+        Mapping of series key to a tuple ``(func, args)`` or ``(func, args, kwargs)``,
+        e.g. ``{"prc_hicp_mmor": (fetch_eurostat_json, ("prc_hicp_mmor", "2020-01-01"))}``.
+    max_workers : int, optional
+        Maximum number of fetches in flight at once. Default is 4.
+
+    Returns:
+    -------
+    dict
+        Mapping of series key to the fetched payload, in the same order as `tasks`.
+        A fetch that raises is logged and mapped to None, so one failing source
+        does not cancel the others.
+    """
+    results = {key: None for key in tasks}
+    if not tasks:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for key, task in tasks.items():
+            func, args, kwargs = (tuple(task) + ({},))[:3]
+            futures[executor.submit(func, *args, **kwargs)] = key
+
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.error(f"Fetch failed for {key}: {e}")
+
+    failed = [key for key, payload in results.items() if payload is None]
+    logger.info(
+        f"Fetched {len(results) - len(failed)} of {len(results)} series concurrently"
+        + (f", missing: {failed}" if failed else "")
+    )
+    return results
+
+
 def _to_year_month(date_str):
     """
     Converts a date string to a 'YYYY-MM' format. If the input is empty,
@@ -48,7 +144,65 @@ def _to_year_month(date_str):
         return pd.to_datetime(date_str).strftime("%Y-%m")
 
 
-def fetch_eurostat_json(data_code: str, from_date: str):
+def incremental_from_date(from_date, latest_date=None, overlap_days=0):
+    """
+    Returns the start date for an incremental fetch: the latest stored date
+    minus `overlap_days` (so revisions of recent periods are picked up again),
+    but never earlier than `from_date`.
+
+    Parameters:
+    ----------
+    from_date : str
+        The configured start date in 'YYYY-MM-DD' format.
+    latest_date : date or str, optional
+        The latest date already stored for the series. If None, the series has
+        no stored data and `from_date` is returned unchanged.
+    overlap_days : int, optional
+        Number of days to re-fetch before `latest_date`. Default is 0.
+
+    Returns:
+    -------
+    str
+        The start date in 'YYYY-MM-DD' format.
+    """
+    if latest_date is None:
+        return from_date
+    start = pd.to_datetime(latest_date) - pd.Timedelta(days=overlap_days)
+    if from_date:
+        start = max(start, pd.to_datetime(from_date))
+    return start.strftime("%Y-%m-%d")
+
+
+def incremental_start_dates(symbols, from_date, latest_dates, overlap_days=0):
+    """
+    Returns the incremental start date of every symbol (see incremental_from_date).
+
+    Parameters:
+    ----------
+    symbols : list of str
+        Series codes, e.g. stock tickers like 'INDEXNASDAQ:OMXSPI'.
+    from_date : str
+        The configured start date in 'YYYY-MM-DD' format.
+    latest_dates : dict
+        Latest stored date per symbol, e.g. from get_latest_stock_dates.
+        Symbols without stored data start at `from_date`.
+    overlap_days : int, optional
+        Number of days to re-fetch before each latest date. Default is 0.
+
+    Returns:
+    -------
+    dict
+        Symbol -> start date in 'YYYY-MM-DD' format.
+    """
+    return {
+        symbol: incremental_from_date(from_date, latest_dates.get(symbol), overlap_days)
+        for symbol in symbols
+    }
+
+
+def fetch_eurostat_json(
+    data_code: str, from_date: str, geo="EU27_2020", filters: dict = None
+):
     """
     Fetches raw JSON data from the Eurostat API for a specific indicator and time range.
 
@@ -61,23 +215,38 @@ def fetch_eurostat_json(data_code: str, from_date: str):
     from_date : str
         The start date for the data range in 'YYYY-MM-DD' format.
         Note: Only the year and month are used; the day is ignored.
+    geo : str, list of str or None, optional
+        Geo code(s) to fetch, e.g. "EU27_2020" or ["SE", "DE", "FR"]. Pass None to
+        fetch all geos in one request. Default is "EU27_2020".
+    filters : dict, optional
+        Extra dimension filters, mapping a dimension id to one value or a list of
+        values, e.g. {"s_adj": "SA", "indic": ["LM-UN-T-TOT", "LM-UN-T-LE25"]}.
+        Dimensions left out are returned in full.
 
     Returns:
     -------
     dict or None
         The raw JSON response from the Eurostat API as a Python dictionary,
         or None if the request fails or the response cannot be decoded.
+        Multi-series cubes can be decoded with eurostat_json_to_long_df.
     """
 
     logger.info(
         f"Fetching Eurostat data for {data_code} and from {_to_year_month(from_date)}"
     )
 
+    params = []
+    geos = [geo] if isinstance(geo, str) else list(geo or [])
+    params.extend(("geo", code) for code in geos)
+    for dimension, selected in (filters or {}).items():
+        selected = [selected] if isinstance(selected, str) else selected
+        params.extend((dimension, value) for value in selected)
+    params.append(("sinceTimePeriod", _to_year_month(from_date)))
+    params.append(("format", "JSON"))
+
     url = (
         f"https://ec.europa.eu/eurostat/api/dissemination/statistics/1.0/data/{data_code}"
-        f"?geo=EU27_2020"
-        f"&sinceTimePeriod={_to_year_month(from_date)}"
-        f"&format=JSON"
+        f"?{urlencode(params)}"
     )
     return fetch_json(url)
 
@@ -88,6 +257,11 @@ def fetch_ecb_json(dataflow_ref, series_key, from_date, to_date):
 
     FM, B.U2.EUR.4F.KR.MRR_FR.LEV: Main Refinancing Operations interest rate for Euro area (monthly).
 
+    The series key may use SDMX wildcards to fetch several series in one
+    request, e.g. "B.U2.EUR.4F.KR.MRR_FR+DFR+MLFR.LEV" for the main refinancing,
+    deposit facility and marginal lending facility rates. Decode such responses
+    with ecb_json_to_long_df.
+
     """
 
     logger.info(
@@ -107,6 +281,8 @@ def fetch_ecb_json(dataflow_ref, series_key, from_date, to_date):
 def fetch_fred_json(series_id, api_key, from_date, to_date):
     """
     Fetches raw JSON data from FRED API.
+    The date range is sent as `observation_start` / `observation_end`, so only
+    the requested window is downloaded. Empty dates leave the range open.
 
     UNRATE: US Unemployment Rate (monthly).
     CPIAUCSL: US Consumer Price Index (CPI) (monthly).
@@ -120,6 +296,10 @@ def fetch_fred_json(series_id, api_key, from_date, to_date):
         f"&api_key={api_key}"
         f"&file_type=json&frequency=m"
     )
+    if from_date:
+        url += f"&observation_start={pd.to_datetime(from_date).strftime('%Y-%m-%d')}"
+    if to_date:
+        url += f"&observation_end={pd.to_datetime(to_date).strftime('%Y-%m-%d')}"
     logger.debug(f"FRED URL: {url}")
     return fetch_json(url)
 
@@ -131,6 +311,9 @@ def get_historical_stock_data(
     Fetches historical stock data for a given symbol from a Google Sheet.
     This function updates the Google Sheet with the specified stock symbol and start date,
     then retrieves the data from the 'output' worksheet.
+    The sheet client is authenticated once per process; each call writes both
+    control cells in one batch update and reads a bounded, unformatted range,
+    so prices arrive as numbers and dates as spreadsheet serial numbers.
     Parameters:
     ----------
     symbol : str
@@ -145,72 +328,155 @@ def get_historical_stock_data(
     Returns:
     -------
     list
-        A list of dicts containing the stock data from the 'output' worksheet.
+        A list of lists containing the stock data from the 'output' worksheet,
+        header row first.
     """
+    try:
+        client = get_sheet_client(service_account_file_path, worksheet_id)
+        data = client.fetch(symbol, start_date)
 
-    # TODO: Gör transform till df på denna data och fixa config där det går.
-    # Transform-biten för index till något som kan batch eller sparas enskilt. Använd mer generella save och load-funktioner.
+        if not data:
+            logger.warning(f"No data found for {symbol}.")
+            return []
+        return data
 
-    SERVICE_ACCOUNT_FILE = (
-        service_account_file_path  # "config/stock-data-462106-4b3b621b4a82.json"
-    )
-    SPREADSHEET_ID = worksheet_id  # "1Ih_rIE-woq0gkrBd5snyl8IxJP0GtM2iVKdPP53TRsM"
+    except Exception as e:
+        logger.error(f"An error occurred fetching {symbol} from Google Sheet: {e}")
+        return []
 
-    # set symbol
-    def select_symbol(symbol, date):
-        """
-        Selects a stock symbol in the Google Sheet and sets the start date.
 
-        Parameters:
-        ----------
-        symbol : str
-            The stock symbol to set in the Google Sheet.
-        start_date : str
+# start date of symbols missing from a start date dict
+DEFAULT_STOCK_START_DATE = "2020-01-01"
+# how often the results queue is checked for workers that exited early
+RESULT_POLL_SECONDS = 1.0
 
-            The start date for the stock data in 'YYYY-MM-DD' format.
-        """
 
+def _drain(q):
+    """Removes every item left in queue `q`."""
+    while True:
         try:
-            gc = gspread.service_account(filename=SERVICE_ACCOUNT_FILE)
-            spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-            worksheet = spreadsheet.worksheet("Data")  # TODO gör dynamisk
+            q.get_nowait()
+        except queue.Empty:
+            return
+
+
+def get_historical_stock_data_many(
+    symbols,
+    service_account_file_path,
+    worksheet_id,
+    start_date=DEFAULT_STOCK_START_DATE,
+    worker_sheets=None,
+    requests_per_minute=SHEETS_REQUESTS_PER_MINUTE,
+):
+    """
+    Fetches historical stock data for many symbols from a Google Sheet and yields
+    the results as they complete.
 
-            # Set symbol in dropdown cell
-            worksheet.update_cell(1, 2, symbol)
-            # Set start date
-            worksheet.update_cell(2, 2, date)  # Row 2, Column 1
+    Each (control sheet, output sheet) pair in `worker_sheets` is an independent
+    copy of the Data/output tabs, served by its own worker thread, so several
+    symbols are fetched in parallel. All workers share one token bucket sized to
+    the Sheets API quota, so the run is bounded by the quota rather than by
+    serial round-trips.
 
+    Parameters:
+    ----------
+    symbols : list of str
+        Stock symbols to fetch, e.g. ['INDEXNASDAQ:OMXSPI', 'INDEXSP:.INX'].
+    service_account_file_path : str
+        Path to the Google service account JSON file for authentication.
+    worksheet_id : str
+        The ID of the Google Sheet to access.
+    start_date : str or dict, optional
+        Start date in 'YYYY-MM-DD' format, or a dict of symbol -> start date
+        where missing symbols start at DEFAULT_STOCK_START_DATE.
+        Default is '2020-01-01'.
+    worker_sheets : list of tuple, optional
+        (control sheet, output sheet) title pairs. Default is [('Data', 'output')].
+    requests_per_minute : int, optional
+        Sheets API requests allowed per minute across all workers.
+
+    Yields:
+    -------
+    tuple
+        (symbol, data) where data is the list of lists from the output sheet,
+        or [] if the fetch failed.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    worker_sheets = worker_sheets or [(CONTROL_SHEET, OUTPUT_SHEET)]
+    if not symbols:
+        return
+
+    gc = get_gspread_client(service_account_file_path)
+    rate_limiter = TokenBucket(requests_per_minute / 60.0, len(worker_sheets))
+    pending = queue.Queue()
+    for symbol in symbols:
+        pending.put(symbol)
+    completed = queue.Queue()
+
+    def work(control_sheet, output_sheet):
+        # A worker whose sheets cannot be opened leaves its symbols to the others
+        try:
+            client = SheetClient(
+                gc,
+                worksheet_id,
+                control_sheet=control_sheet,
+                output_sheet=output_sheet,
+                rate_limiter=rate_limiter,
+            )
+            client.worksheet(control_sheet)
+            client.worksheet(output_sheet)
         except Exception as e:
-            print(f"An error occurred: {e}")
-
-    try:
-        # select symbol to fetch data for
-        select_symbol(symbol, start_date)
-
-        # Authenticate with the service account
-        gc = gspread.service_account(filename=SERVICE_ACCOUNT_FILE)
-
-        # Open the spreadsheet by its ID
-        spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-
-        # Select the worksheet (e.g., 'Sheet1' or by index 0 for the first sheet)
-        worksheet = spreadsheet.worksheet(
-            "output"  # TODO - gör config
-        )  # Or worksheet = spreadsheet.get_worksheet(0)
-
-        # Get all records (data from all rows as a list of dictionaries)
-        # data = worksheet.get_all_records()
-        data = worksheet.get_all_values()  # to include comma signs
-
-        if not data:
-            print("No data found.")
-            return []
-
-        # print("Daily Financial Data:")
-        # for row in data:
-        #     print(row)
-        return data
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return []
+            logger.error(
+                f"Could not open worker sheets {control_sheet}/{output_sheet}: {e}"
+            )
+            return
+        while True:
+            try:
+                symbol = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                symbol_start = (
+                    start_date.get(symbol, DEFAULT_STOCK_START_DATE)
+                    if isinstance(start_date, dict)
+                    else start_date
+                )
+                data = client.fetch(symbol, symbol_start)
+            except Exception as e:
+                logger.error(
+                    f"An error occurred fetching {symbol} from Google Sheet: {e}"
+                )
+                data = []
+            completed.put((symbol, data))
+
+    with ThreadPoolExecutor(max_workers=len(worker_sheets)) as executor:
+        futures = [
+            executor.submit(work, control_sheet, output_sheet)
+            for control_sheet, output_sheet in worker_sheets
+        ]
+        remaining = len(symbols)
+        try:
+            while remaining:
+                try:
+                    result = completed.get(timeout=RESULT_POLL_SECONDS)
+                except queue.Empty:
+                    if all(future.done() for future in futures) and completed.empty():
+                        break
+                    continue
+                remaining -= 1
+                yield result
+        except GeneratorExit:
+            # closed early, so workers stop after their current symbol
+            _drain(pending)
+            raise
+        for future in futures:
+            future.result()
+
+    # symbols left over when every worker failed to open its sheets
+    while True:
+        try:
+            symbol = pending.get_nowait()
+        except queue.Empty:
+            return
+        logger.error(f"No worker sheet available to fetch {symbol}")
+        yield symbol, []
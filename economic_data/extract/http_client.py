@@ -0,0 +1,203 @@
+# economic_data/extract/http_client.py
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 5.0  # seconds
+DEFAULT_READ_TIMEOUT = 30.0  # seconds
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_JITTER = 0.5
+DEFAULT_POOL_MAXSIZE = 4  # connections kept open per host
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# (requests per second, burst size) per host. FRED allows 120 requests per
+# minute per API key; Eurostat and ECB do not publish hard quotas, so they
+# get a conservative default.
+HOST_RATE_LIMITS = {
+    "api.stlouisfed.org": (2.0, 5),
+    "ec.europa.eu": (3.0, 5),
+    "data-api.ecb.europa.eu": (3.0, 5),
+}
+DEFAULT_RATE_LIMIT = (5.0, 10)
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to cap the request rate against one host.
+
+    Attributes:
+
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens, i.e. the allowed burst.
+        clock (callable): Monotonic clock in seconds, replaceable in tests.
+        sleep (callable): Function used to wait for tokens, replaceable in tests.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Blocks until `tokens` are available and consumes them."""
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            self.sleep(wait)
+
+
+class RateLimitedRetry(Retry):
+    """urllib3 Retry that takes a token from the host's bucket for every retry.
+
+    urllib3 sends retries itself, below HttpClient.get, so without this a
+    burst of 429 or 5xx responses would retry past the per-host rate limit.
+
+    Attributes:
+
+        bucket_for (callable): Returns the TokenBucket of a host, None to
+            retry without throttling.
+    """
+
+    def __init__(self, *args, bucket_for=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bucket_for = bucket_for
+
+    def new(self, **kw):
+        kw.setdefault("bucket_for", self.bucket_for)
+        return super().new(**kw)
+
+    def increment(self, *args, **kwargs):
+        # raises MaxRetryError when no retries are left, so only real retries pay
+        retry = super().increment(*args, **kwargs)
+        pool = kwargs.get("_pool")
+        if self.bucket_for is not None and pool is not None:
+            self.bucket_for(pool.host).acquire()
+        return retry
+
+
+class HttpClient:
+    """Pooled keep-alive HTTP client shared by all fetch_* functions.
+
+    One `requests.Session` keeps connections open per host, so consecutive
+    series from the same API reuse the TLS connection. GET requests are
+    retried with exponential backoff and jitter on 429 and 5xx responses,
+    and each host is throttled by its own token bucket, which every retry
+    also draws from (see RateLimitedRetry).
+    """
+
+    def __init__(
+        self,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        max_retries=DEFAULT_MAX_RETRIES,
+        backoff_factor=DEFAULT_BACKOFF_FACTOR,
+        backoff_jitter=DEFAULT_BACKOFF_JITTER,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        rate_limits=None,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limits = dict(HOST_RATE_LIMITS)
+        self.rate_limits.update(rate_limits or {})
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+        retry = RateLimitedRetry(
+            bucket_for=self._bucket_for,
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        )
+        # pool_block caps the number of open connections per host
+        adapter = HTTPAdapter(
+            pool_connections=len(self.rate_limits) + 1,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _bucket_for(self, host):
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, capacity = self.rate_limits.get(host, DEFAULT_RATE_LIMIT)
+                bucket = TokenBucket(rate, capacity)
+                self._buckets[host] = bucket
+            return bucket
+
+    def get(self, url, headers=None, timeout=None):
+        """
+        Sends a rate-limited GET request through the pooled session.
+
+        Parameters:
+        ----------
+        url : str
+            The URL to fetch.
+        headers : dict, optional
+            Extra request headers.
+        timeout : tuple, optional
+            (connect, read) timeout in seconds. Defaults to the client timeout.
+
+        Returns:
+        -------
+        requests.Response
+        """
+        self._bucket_for(urlsplit(url).hostname).acquire()
+        return self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Returns the process-wide HttpClient, creating it with defaults on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def configure_http_client(**kwargs):
+    """
+    Replaces the process-wide HttpClient with one built from `kwargs`
+    (see HttpClient for the accepted settings) and returns it.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(**kwargs)
+        logger.info(
+            f"Configured HTTP client with timeout {_client.timeout} "
+            f"and {kwargs.get('max_retries', DEFAULT_MAX_RETRIES)} retries"
+        )
+        return _client
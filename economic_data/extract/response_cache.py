@@ -0,0 +1,205 @@
+# economic_data/extract/response_cache.py
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "cache",
+    "http_cache.sqlite",
+)
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# query parameters that carry credentials and must never end up in a cache key
+SECRET_QUERY_PARAMS = {"api_key", "apikey", "key", "token", "access_token"}
+
+
+def normalize_cache_key(url):
+    """
+    Normalizes a URL into a cache key: lower-cases scheme and host, sorts the
+    query parameters and strips credentials such as FRED's `api_key`.
+
+    Parameters:
+    ----------
+    url : str
+        The request URL.
+
+    Returns:
+    -------
+    str
+        The normalized URL used as cache key.
+    """
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in SECRET_QUERY_PARAMS
+    )
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path,
+            urlencode(query, safe=":+,"),
+            "",
+        )
+    )
+
+
+class ResponseCache:
+    """Persistent HTTP response cache stored in a single SQLite file.
+
+    Entries keep the raw response body together with its ETag and
+    Last-Modified validators, so later requests can be made conditional.
+    Entries that have not been refreshed within `ttl_seconds` are evicted,
+    and the least recently used entries are dropped once the total body
+    size exceeds `max_bytes`.
+
+    Attributes:
+
+        path (str): Path to the SQLite cache file.
+        ttl_seconds (float or None): Maximum age since the last refresh, None to disable.
+        max_bytes (int or None): Maximum total size of cached bodies, None to disable.
+        offline (bool): If True, fetch_json serves only from cache and never hits the network.
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_CACHE_PATH,
+        ttl_seconds=DEFAULT_TTL_SECONDS,
+        max_bytes=DEFAULT_MAX_BYTES,
+        offline=False,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    body BLOB NOT NULL
+                )
+                """)
+        self.evict()
+
+    @contextmanager
+    def _connect(self):
+        """Yields a connection in a transaction, closing it afterwards."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """
+        Returns the cached entry for `key` as a dict with 'etag', 'last_modified',
+        'fetched_at' and 'body', or None on a miss. Expired entries count as misses.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, fetched_at, body FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if self.ttl_seconds is not None and now - row[2] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "fetched_at": row[2],
+            "body": row[3],
+        }
+
+    def put(self, key, body, etag=None, last_modified=None):
+        """Stores a response body and its validators, then enforces the size limit."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, etag, last_modified, fetched_at, accessed_at, size, body)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, etag, last_modified, now, now, len(body), body),
+            )
+        self.evict()
+
+    def touch(self, key):
+        """Marks an entry as revalidated, e.g. after a 304 Not Modified response."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+
+    def evict(self):
+        """Drops expired entries, then least recently used ones above `max_bytes`."""
+        with self._lock, self._connect() as conn:
+            if self.ttl_seconds is not None:
+                conn.execute(
+                    "DELETE FROM responses WHERE fetched_at < ?",
+                    (time.time() - self.ttl_seconds,),
+                )
+            if self.max_bytes is None:
+                return
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+            logger.info(
+                f"Evicted {len(evicted)} cached responses to stay under size limit"
+            )
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """Returns the process-wide ResponseCache, or None if caching is disabled."""
+    return _response_cache
+
+
+def set_response_cache(cache):
+    """Sets the process-wide ResponseCache used by fetch_json. Pass None to disable."""
+    global _response_cache
+    _response_cache = cache
+    return cache
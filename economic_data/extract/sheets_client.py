@@ -0,0 +1,124 @@
+# economic_data/extract/sheets_client.py
+import logging
+import threading
+
+import gspread
+from gspread.utils import ValueInputOption, ValueRenderOption
+
+logger = logging.getLogger(__name__)
+
+CONTROL_SHEET = "Data"  # B1 = symbol, B2 = start date
+OUTPUT_SHEET = "output"
+CONTROL_RANGE = "B1:B2"
+OUTPUT_COLUMNS = "A:G"  # ticker, date, open, high, low, close, volume
+DEFAULT_MAX_ROWS = 10000
+# Google Sheets API read quota is 60 requests per minute per user
+SHEETS_REQUESTS_PER_MINUTE = 60
+
+
+class SheetClient:
+    """Google Finance history sheet accessed through one authenticated client.
+
+    The spreadsheet and its worksheets are opened once and reused, so fetching
+    a symbol costs two API calls: one batch_update writing the symbol and start
+    date control cells, and one bounded read of the output sheet with
+    UNFORMATTED_VALUE, which returns prices as numbers and dates as serial
+    numbers instead of locale-formatted strings.
+
+    Attributes:
+
+        spreadsheet_id (str): ID of the Google Sheet.
+        control_sheet (str): Worksheet holding the symbol and start date cells.
+        output_sheet (str): Worksheet the GOOGLEFINANCE output is read from.
+        max_rows (int): Maximum number of data rows read from the output sheet.
+        rate_limiter (TokenBucket or None): Shared limiter acquired before every API call.
+    """
+
+    def __init__(
+        self,
+        gc,
+        spreadsheet_id,
+        control_sheet=CONTROL_SHEET,
+        output_sheet=OUTPUT_SHEET,
+        max_rows=DEFAULT_MAX_ROWS,
+        rate_limiter=None,
+    ):
+        self.gc = gc
+        self.spreadsheet_id = spreadsheet_id
+        self.control_sheet = control_sheet
+        self.output_sheet = output_sheet
+        self.max_rows = max_rows
+        self.rate_limiter = rate_limiter
+        self._spreadsheet = None
+        self._worksheets = {}
+        self._lock = threading.Lock()
+
+    def _throttle(self):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def worksheet(self, title):
+        """Returns the worksheet `title`, opening the spreadsheet on first use."""
+        with self._lock:
+            if self._spreadsheet is None:
+                self._throttle()
+                self._spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
+            if title not in self._worksheets:
+                self._throttle()
+                self._worksheets[title] = self._spreadsheet.worksheet(title)
+            return self._worksheets[title]
+
+    def select(self, symbol, start_date):
+        """Writes the symbol and start date control cells in one batch_update call."""
+        worksheet = self.worksheet(self.control_sheet)
+        self._throttle()
+        worksheet.batch_update(
+            [{"range": CONTROL_RANGE, "values": [[symbol], [start_date]]}],
+            value_input_option=ValueInputOption.user_entered,
+        )
+
+    def read_output(self):
+        """Reads the header and up to `max_rows` data rows of the output sheet, typed."""
+        first, last = OUTPUT_COLUMNS.split(":")
+        worksheet = self.worksheet(self.output_sheet)
+        self._throttle()
+        values = worksheet.get(
+            f"{first}1:{last}{self.max_rows + 1}",
+            value_render_option=ValueRenderOption.unformatted,
+        )
+        return [list(row) for row in values]
+
+    def fetch(self, symbol, start_date):
+        """Selects `symbol` from `start_date` and returns the output sheet rows."""
+        self.select(symbol, start_date)
+        data = self.read_output()
+        logger.info(f"Read {max(len(data) - 1, 0)} rows for {symbol} from sheet")
+        return data
+
+
+_gspread_clients = {}
+_sheet_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_gspread_client(service_account_file):
+    """Returns a gspread client authenticated once per service account file and process."""
+    with _clients_lock:
+        if service_account_file not in _gspread_clients:
+            _gspread_clients[service_account_file] = gspread.service_account(
+                filename=service_account_file
+            )
+        return _gspread_clients[service_account_file]
+
+
+def get_sheet_client(service_account_file, spreadsheet_id, **kwargs):
+    """
+    Returns the shared SheetClient for a spreadsheet and set of options (see
+    SheetClient), creating it on first use.
+    """
+    key = (service_account_file, spreadsheet_id, tuple(sorted(kwargs.items())))
+    gc = get_gspread_client(service_account_file)
+    with _clients_lock:
+        if key not in _sheet_clients:
+            _sheet_clients[key] = SheetClient(gc, spreadsheet_id, **kwargs)
+        return _sheet_clients[key]
@@ -1,5 +1,8 @@
 # economic_data/load/save_data.py
 
+import pandas as pd
+from sqlalchemy import func, select
+
 from economic_data.db.schema import (
     EconomicIndicator,
     EconomicIndicatorData,
@@ -9,6 +12,93 @@ from economic_data.db.schema import (
 )
 from economic_data.db.session import Session
 
+# Explicit dtypes for the columnar readers, 'date' is parsed separately
+INDICATOR_DATA_DTYPES = {"indicator_id": "int64", "value": "float64"}
+STOCK_DATA_DTYPES = {
+    "index_id": "int64",
+    "open_value": "float64",
+    "high_value": "float64",
+    "low_value": "float64",
+    "close_value": "float64",
+    "volume": "float64",
+}
+DEFAULT_INDICATOR_COLUMNS = ["date", "value"]
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_STOCK_COLUMNS = [
+    "date",
+    "open_value",
+    "high_value",
+    "low_value",
+    "close_value",
+    "volume",
+]
+
+
+def _select_columns(model, columns):
+    table = model.__table__
+    unknown = [c for c in columns if c not in table.c]
+    if unknown:
+        raise ValueError(f"Unknown columns for {table.name}: {unknown}")
+    return [table.c[c] for c in columns]
+
+
+def _date_range_filter(date_column, start, end):
+    """Returns WHERE clauses bounding `date_column` to [start, end]; None leaves a side open."""
+    clauses = []
+    if start is not None:
+        clauses.append(date_column >= pd.to_datetime(start).date())
+    if end is not None:
+        clauses.append(date_column <= pd.to_datetime(end).date())
+    return clauses
+
+
+def _to_wide(df, key_column, value_column):
+    """Pivots a long (key, date, value) frame to one column per series, indexed by date."""
+    wide = df.pivot(index="date", columns=key_column, values=value_column)
+    wide.columns.name = key_column
+    return wide
+
+
+def _read_frame(stmt, dtypes):
+    """
+    Runs a Core select and returns the result as a DataFrame with a parsed
+    'date' column and the given dtypes, without building ORM objects.
+    """
+    session = Session()
+    try:
+        df = pd.read_sql(stmt, session.connection())
+    finally:
+        session.close()
+    return _apply_dtypes(df, dtypes)
+
+
+def _apply_dtypes(df, dtypes):
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
+    return df.astype({c: t for c, t in dtypes.items() if c in df.columns})
+
+
+def _iter_chunks(stmt, dtypes, chunk_size, as_frames):
+    """
+    Streams the result of a Core select in chunks of `chunk_size` rows using
+    yield_per, so only one chunk is held in memory at a time.
+    """
+    session = Session()
+    try:
+        result = session.connection().execute(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        columns = list(result.keys())
+        for rows in result.partitions(chunk_size):
+            if as_frames:
+                yield _apply_dtypes(
+                    pd.DataFrame.from_records(rows, columns=columns), dtypes
+                )
+            else:
+                yield [tuple(row) for row in rows]
+    finally:
+        session.close()
+
 
 def get_all_indicators():
     session = Session()
@@ -30,6 +120,106 @@ def get_indicator_data(indicator_id: int):
         session.close()
 
 
+def get_latest_indicator_dates():
+    """
+    Returns the latest stored date per indicator as a dict keyed by
+    EconomicIndicator.name, using one grouped MAX(date) query.
+    """
+    session = Session()
+    try:
+        rows = (
+            session.query(EconomicIndicator.name, func.max(EconomicIndicatorData.date))
+            .join(
+                EconomicIndicatorData,
+                EconomicIndicatorData.indicator_id == EconomicIndicator.id,
+            )
+            .group_by(EconomicIndicator.name)
+            .all()
+        )
+        return {name: latest for name, latest in rows}
+    finally:
+        session.close()
+
+
+def get_indicator_frame(indicator_id: int, columns=None) -> pd.DataFrame:
+    """
+    Reads the data points of one indicator as a DataFrame, sorted by date.
+
+    Args:
+        indicator_id (int): Primary key of the EconomicIndicator.
+        columns (list, optional): Columns of economic_indicator_data to read.
+            Defaults to ['date', 'value'].
+
+    Returns:
+        pd.DataFrame: One column per requested column, 'date' as datetime64 and
+        'value' as float64.
+    """
+    columns = columns or DEFAULT_INDICATOR_COLUMNS
+    stmt = (
+        select(*_select_columns(EconomicIndicatorData, columns))
+        .where(EconomicIndicatorData.indicator_id == indicator_id)
+        .order_by(EconomicIndicatorData.date)
+    )
+    return _read_frame(stmt, INDICATOR_DATA_DTYPES)
+
+
+def get_indicator_data_many(ids, start=None, end=None, wide=False) -> pd.DataFrame:
+    """
+    Reads several indicators over a date range with one query.
+
+    The query is `WHERE indicator_id IN (...) AND date BETWEEN start AND end`
+    ordered by (indicator_id, date), which SQLite answers with range scans on
+    the (indicator_id, date) unique index.
+
+    Args:
+        ids (list of int): Primary keys of the EconomicIndicators.
+        start (date or str, optional): First date to include, open if None.
+        end (date or str, optional): Last date to include, open if None.
+        wide (bool): If True, return one column per indicator_id indexed by date
+            instead of the long (indicator_id, date, value) frame.
+
+    Returns:
+        pd.DataFrame
+    """
+    table = EconomicIndicatorData.__table__
+    stmt = (
+        select(table.c.indicator_id, table.c.date, table.c.value)
+        .where(table.c.indicator_id.in_(list(ids)))
+        .where(*_date_range_filter(table.c.date, start, end))
+        .order_by(table.c.indicator_id, table.c.date)
+    )
+    df = _read_frame(stmt, INDICATOR_DATA_DTYPES)
+    return _to_wide(df, "indicator_id", "value") if wide else df
+
+
+def iter_indicator_data(
+    ids=None, start=None, end=None, chunk_size=DEFAULT_CHUNK_SIZE, as_frames=True
+):
+    """
+    Streams economic_indicator_data in chunks, ordered by (indicator_id, date).
+
+    Args:
+        ids (list of int, optional): Indicators to read, all if None.
+        start (date or str, optional): First date to include, open if None.
+        end (date or str, optional): Last date to include, open if None.
+        chunk_size (int): Rows per chunk.
+        as_frames (bool): Yield DataFrames with 'indicator_id', 'date' and 'value'
+            if True, else lists of (indicator_id, date, value) tuples.
+
+    Yields:
+        pd.DataFrame or list of tuples, one per chunk.
+    """
+    table = EconomicIndicatorData.__table__
+    stmt = (
+        select(table.c.indicator_id, table.c.date, table.c.value)
+        .where(*_date_range_filter(table.c.date, start, end))
+        .order_by(table.c.indicator_id, table.c.date)
+    )
+    if ids is not None:
+        stmt = stmt.where(table.c.indicator_id.in_(list(ids)))
+    yield from _iter_chunks(stmt, INDICATOR_DATA_DTYPES, chunk_size, as_frames)
+
+
 def get_all_stock_indices():
     session = Session()
     try:
@@ -46,6 +236,116 @@ def get_stock_data(index_id: int):
         session.close()
 
 
+def get_stock_frame(index_id: int, columns=None) -> pd.DataFrame:
+    """
+    Reads the daily data points of one stock index as a DataFrame, sorted by date.
+
+    Args:
+        index_id (int): Primary key of the StockIndex.
+        columns (list, optional): Columns of stock_index_data to read. Defaults to
+            date, open/high/low/close values and volume.
+
+    Returns:
+        pd.DataFrame: One column per requested column, 'date' as datetime64 and
+        prices and volume as float64.
+    """
+    columns = columns or DEFAULT_STOCK_COLUMNS
+    stmt = (
+        select(*_select_columns(StockIndexData, columns))
+        .where(StockIndexData.index_id == index_id)
+        .order_by(StockIndexData.date)
+    )
+    return _read_frame(stmt, STOCK_DATA_DTYPES)
+
+
+def get_stock_data_many(
+    ids, start=None, end=None, columns=None, wide=False, value_column="close_value"
+) -> pd.DataFrame:
+    """
+    Reads several stock indices over a date range with one query, using the
+    (index_id, date) unique index for range scans.
+
+    Args:
+        ids (list of int): Primary keys of the StockIndexes.
+        start (date or str, optional): First date to include, open if None.
+        end (date or str, optional): Last date to include, open if None.
+        columns (list, optional): Value columns to read in long format. Defaults
+            to open/high/low/close values and volume.
+        wide (bool): If True, return one column per index_id indexed by date,
+            holding `value_column`.
+        value_column (str): Column to pivot on when `wide` is True.
+
+    Returns:
+        pd.DataFrame
+    """
+    columns = [value_column] if wide else columns or DEFAULT_STOCK_COLUMNS[1:]
+    columns = ["index_id", "date"] + [c for c in columns if c != "date"]
+    table = StockIndexData.__table__
+    stmt = (
+        select(*_select_columns(StockIndexData, columns))
+        .where(table.c.index_id.in_(list(ids)))
+        .where(*_date_range_filter(table.c.date, start, end))
+        .order_by(table.c.index_id, table.c.date)
+    )
+    df = _read_frame(stmt, STOCK_DATA_DTYPES)
+    return _to_wide(df, "index_id", value_column) if wide else df
+
+
+def iter_stock_data(
+    ids=None,
+    start=None,
+    end=None,
+    columns=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    as_frames=True,
+):
+    """
+    Streams stock_index_data in chunks, ordered by (index_id, date).
+
+    Args:
+        ids (list of int, optional): Stock indices to read, all if None.
+        start (date or str, optional): First date to include, open if None.
+        end (date or str, optional): Last date to include, open if None.
+        columns (list, optional): Value columns to read. Defaults to
+            open/high/low/close values and volume.
+        chunk_size (int): Rows per chunk.
+        as_frames (bool): Yield DataFrames if True, else lists of row tuples
+            starting with (index_id, date).
+
+    Yields:
+        pd.DataFrame or list of tuples, one per chunk.
+    """
+    columns = columns or DEFAULT_STOCK_COLUMNS[1:]
+    columns = ["index_id", "date"] + [c for c in columns if c != "date"]
+    table = StockIndexData.__table__
+    stmt = (
+        select(*_select_columns(StockIndexData, columns))
+        .where(*_date_range_filter(table.c.date, start, end))
+        .order_by(table.c.index_id, table.c.date)
+    )
+    if ids is not None:
+        stmt = stmt.where(table.c.index_id.in_(list(ids)))
+    yield from _iter_chunks(stmt, STOCK_DATA_DTYPES, chunk_size, as_frames)
+
+
+def get_latest_stock_dates():
+    """
+    Returns the latest stored date per stock index as a dict keyed by
+    StockIndex.ticker_id, using one grouped MAX(date) query.
+    """
+    session = Session()
+    try:
+        rows = (
+            session.query(StockIndex.ticker_id, func.max(StockIndexData.date))
+            .join(StockIndexData, StockIndexData.index_id == StockIndex.id)
+            .group_by(StockIndex.ticker_id)
+            .all()
+        )
+        return {ticker_id: latest for ticker_id, latest in rows}
+    finally:
+        session.close()
+
+
 def get_thresholds_for_indicator(indicator_id: int):
     session = Session()
     try:
@@ -0,0 +1,324 @@
+# economic_data/load/parquet_archive.py
+import json
+import logging
+import os
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from economic_data.load.load_data import (
+    get_all_indicators,
+    get_all_stock_indices,
+    iter_indicator_data,
+    iter_stock_data,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "archive"
+)
+COMPRESSION = "zstd"
+# high-water marks per series, ignored by dataset discovery (leading "_")
+MANIFEST_FILE = "_manifest.json"
+# rows buffered by a sync before they are written in one append
+SYNC_BATCH_ROWS = 500000
+# files a partition may hold before a sync compacts it, so the current year is
+# not rewritten on every run
+COMPACT_MIN_FILES = 8
+
+PARTITION_SCHEMA = pa.schema(
+    [("source", pa.string()), ("series", pa.string()), ("year", pa.int16())]
+)
+ARCHIVE_SCHEMAS = {
+    "indicators": pa.schema([("date", pa.date32()), ("value", pa.float64())]),
+    "stocks": pa.schema(
+        [
+            ("date", pa.date32()),
+            ("open_value", pa.float64()),
+            ("high_value", pa.float64()),
+            ("low_value", pa.float64()),
+            ("close_value", pa.float64()),
+            ("volume", pa.float64()),
+        ]
+    ),
+}
+
+
+def _archive_path(kind, root):
+    if kind not in ARCHIVE_SCHEMAS:
+        raise ValueError(f"Unknown archive kind: {kind}")
+    return os.path.join(root, kind)
+
+
+def _read_manifest(kind, root):
+    try:
+        with open(os.path.join(_archive_path(kind, root), MANIFEST_FILE)) as f:
+            return {series: pd.Timestamp(date) for series, date in json.load(f).items()}
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(kind, root, latest):
+    path = os.path.join(_archive_path(kind, root), MANIFEST_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {series: date.strftime("%Y-%m-%d") for series, date in latest.items()},
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+    os.replace(tmp_path, path)
+
+
+def append_to_archive(df, kind, root=DEFAULT_ARCHIVE_DIR):
+    """
+    Appends rows to the Parquet archive, partitioned as source=/series=/year=.
+
+    Every call writes new zstd-compressed, dictionary-encoded files with a unique
+    name, so earlier files are never rewritten (see compact_archive). The
+    latest date per series is recorded in the archive manifest. Callers are
+    responsible for not appending dates that are already archived (see
+    sync_indicator_archive).
+
+    Args:
+        df (pd.DataFrame): Rows with 'source', 'series', 'date' and the value
+            columns of the archive kind.
+        kind (str): "indicators" or "stocks".
+        root (str): Root directory of the archive.
+
+    Returns:
+        int: Number of rows written.
+    """
+    if df.empty:
+        return 0
+    latest = latest_archived_dates(kind, root)
+    value_schema = ARCHIVE_SCHEMAS[kind]
+    frame = pd.DataFrame(
+        {
+            "source": df["source"].astype(str).to_numpy(),
+            "series": df["series"].astype(str).to_numpy(),
+            "year": pd.to_datetime(df["date"]).dt.year.astype("int16").to_numpy(),
+            "date": pd.to_datetime(df["date"]).dt.date.to_numpy(),
+        }
+    )
+    for name in value_schema.names[1:]:
+        frame[name] = df[name].to_numpy(dtype=float) if name in df else float("nan")
+    table = pa.Table.from_pandas(
+        frame,
+        schema=pa.unify_schemas([PARTITION_SCHEMA, value_schema]),
+        preserve_index=False,
+    )
+
+    ds.write_dataset(
+        table,
+        _archive_path(kind, root),
+        format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression=COMPRESSION, use_dictionary=True
+        ),
+    )
+    for series, date in frame.groupby("series")["date"].max().items():
+        date = pd.Timestamp(date)
+        latest[series] = max(latest.get(series, date), date)
+    _write_manifest(kind, root, latest)
+    logger.info(f"Appended {len(frame)} rows to the {kind} Parquet archive")
+    return len(frame)
+
+
+def _dataset(kind, root):
+    return ds.dataset(
+        _archive_path(kind, root),
+        format="parquet",
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+    )
+
+
+def read_archive(
+    kind,
+    root=DEFAULT_ARCHIVE_DIR,
+    series=None,
+    sources=None,
+    start=None,
+    end=None,
+    columns=None,
+):
+    """
+    Reads from the Parquet archive with predicate pushdown.
+
+    Filters on `series`, `sources` and the years of `start`/`end` prune whole
+    partitions, and the date bounds are checked against row-group statistics,
+    so only the matching compressed column chunks are read.
+
+    Args:
+        kind (str): "indicators" or "stocks".
+        root (str): Root directory of the archive.
+        series (list of str, optional): Series codes (indicator_id or ticker_id).
+        sources (list of str, optional): Sources, e.g. ["Eurostat", "FRED"].
+        start (date or str, optional): First date to include.
+        end (date or str, optional): Last date to include.
+        columns (list, optional): Columns to read, all if None.
+
+    Returns:
+        pd.DataFrame: Sorted by series and date, with 'date' as datetime64.
+    """
+    path = _archive_path(kind, root)
+    if not os.path.isdir(path):
+        return pd.DataFrame(columns=columns or ["source", "series", "date"])
+
+    condition = None
+
+    def _and(expression):
+        nonlocal condition
+        condition = expression if condition is None else condition & expression
+
+    if series is not None:
+        _and(pc.field("series").isin(list(series)))
+    if sources is not None:
+        _and(pc.field("source").isin(list(sources)))
+    if start is not None:
+        start = pd.to_datetime(start)
+        _and(pc.field("year") >= start.year)
+        _and(pc.field("date") >= pa.scalar(start.date(), pa.date32()))
+    if end is not None:
+        end = pd.to_datetime(end)
+        _and(pc.field("year") <= end.year)
+        _and(pc.field("date") <= pa.scalar(end.date(), pa.date32()))
+
+    table = _dataset(kind, root).to_table(columns=columns, filter=condition)
+    df = table.to_pandas()
+    for column in ("source", "series"):
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"])
+    sort_by = [c for c in ("series", "date") if c in df.columns]
+    return df.sort_values(sort_by).reset_index(drop=True) if sort_by else df
+
+
+def latest_archived_dates(kind, root=DEFAULT_ARCHIVE_DIR):
+    """
+    Returns the latest archived date per series as a dict of series -> Timestamp.
+
+    The dates are read from the archive manifest. An archive without a
+    manifest is scanned once and the manifest is written from the result.
+    """
+    latest = _read_manifest(kind, root)
+    if latest is not None:
+        return latest
+    df = read_archive(kind, root, columns=["series", "date"])
+    if df.empty:
+        return {}
+    latest = df.groupby("series", observed=True)["date"].max().to_dict()
+    _write_manifest(kind, root, latest)
+    return latest
+
+
+def compact_archive(kind, root=DEFAULT_ARCHIVE_DIR, min_files=2):
+    """
+    Rewrites every partition that holds at least `min_files` files into a
+    single file sorted by date, so appends from many runs do not leave many
+    small files. Syncs call it with COMPACT_MIN_FILES; call it with the
+    default to compact the whole archive.
+
+    Returns:
+        int: Number of partitions compacted.
+    """
+    compacted = 0
+    for directory, _, files in os.walk(_archive_path(kind, root)):
+        parts = sorted(f for f in files if f.endswith(".parquet"))
+        if len(parts) < max(min_files, 2):
+            continue
+        paths = [os.path.join(directory, f) for f in parts]
+        table = pa.concat_tables([pq.ParquetFile(p).read() for p in paths])
+        name = f"part-{uuid.uuid4().hex}-0.parquet"
+        # the leading "." hides the file from dataset discovery until it is complete
+        tmp_path = os.path.join(directory, f".{name}.tmp")
+        pq.write_table(
+            table.sort_by("date"),
+            tmp_path,
+            compression=COMPRESSION,
+            use_dictionary=True,
+        )
+        os.replace(tmp_path, os.path.join(directory, name))
+        for path in paths:
+            os.remove(path)
+        compacted += 1
+    if compacted:
+        logger.info(f"Compacted {compacted} partitions of the {kind} Parquet archive")
+    return compacted
+
+
+def _sync(kind, series_rows, iter_chunks, root, batch_rows=SYNC_BATCH_ROWS):
+    latest = latest_archived_dates(kind, root)
+    written = 0
+    pending, pending_rows = [], 0
+
+    def flush():
+        nonlocal written, pending, pending_rows
+        if pending:
+            written += append_to_archive(
+                pd.concat(pending, ignore_index=True), kind, root
+            )
+        pending, pending_rows = [], 0
+
+    # new rows of all series are batched, so a run writes one file per partition
+    for series_id, code, source in series_rows:
+        start = latest.get(code)
+        start = start + pd.Timedelta(days=1) if start is not None else None
+        for chunk in iter_chunks([series_id], start):
+            chunk["series"] = code
+            chunk["source"] = source or "unknown"
+            pending.append(chunk)
+            pending_rows += len(chunk)
+            if pending_rows >= batch_rows:
+                flush()
+    flush()
+    if written:
+        compact_archive(kind, root, min_files=COMPACT_MIN_FILES)
+    logger.info(f"Synced {written} new rows into the {kind} Parquet archive")
+    return written
+
+
+def sync_indicator_archive(root=DEFAULT_ARCHIVE_DIR):
+    """
+    Mirrors economic_indicator_data into the archive, appending only rows dated
+    after the latest archived date of each indicator. Revisions of already
+    archived dates are not rewritten.
+
+    Returns:
+        int: Number of rows appended.
+    """
+    rows = [(i.id, i.indicator_id, i.source) for i in get_all_indicators()]
+    return _sync(
+        "indicators",
+        rows,
+        lambda ids, start: iter_indicator_data(ids, start=start),
+        root,
+    )
+
+
+def sync_stock_archive(root=DEFAULT_ARCHIVE_DIR):
+    """
+    Mirrors stock_index_data into the archive, appending only rows dated after
+    the latest archived date of each index.
+
+    Returns:
+        int: Number of rows appended.
+    """
+    rows = [(i.id, i.ticker_id, i.source) for i in get_all_stock_indices()]
+    return _sync(
+        "stocks",
+        rows,
+        lambda ids, start: iter_stock_data(ids, start=start),
+        root,
+    )
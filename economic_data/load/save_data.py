@@ -1,5 +1,7 @@
 # economic_data/load/save_data.py
 import logging
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 import pandas as pd
 
@@ -14,6 +16,18 @@ from economic_data.db.schema import (
 )
 from economic_data.db.session import Session
 
+DEFAULT_BATCH_SIZE = 5000
+
+INDICATOR_DATA_COLUMNS = ["date", "value"]
+STOCK_DATA_COLUMNS = [
+    "date",
+    "open_value",
+    "high_value",
+    "low_value",
+    "close_value",
+    "volume",
+]
+
 
 def save_indicator(indicator_data: dict):
     session = Session()
@@ -45,35 +59,92 @@ def save_indicator(indicator_data: dict):
         session.close()
 
 
-def save_indicator_data(indicator_id: int, data: list):
-    session = Session()
-    try:
-        # Fetch all existing (indicator_id, date) combinations
-        existing = set(
-            session.query(EconomicIndicatorData.date)
-            .filter(EconomicIndicatorData.indicator_id == indicator_id)
-            .all()
+def _to_load_frame(data, columns, required):
+    """
+    Converts a DataFrame or a list of dicts into a frame with the given columns,
+    python `date` objects in 'date' and no rows missing a required value.
+
+    Raises:
+        ValueError: If a date appears more than once, e.g. because the data
+            holds several series, which would otherwise overwrite each other.
+    """
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+    df = df.reindex(columns=columns)
+    if df.empty:
+        return df
+    df["date"] = pd.to_datetime(df["date"]).dt.date
+    df = df.dropna(subset=["date"] + required)
+    duplicated = df["date"][df["date"].duplicated()].unique()
+    if len(duplicated):
+        raise ValueError(
+            f"{len(duplicated)} dates appear more than once, e.g. "
+            f"{sorted(duplicated)[:5]}; load one series at a time"
         )
-        # Flatten from list of tuples to set of dates
-        existing_dates = {d[0] for d in existing}
-
-        new_records = []
-        for entry in data:
-            entry_date = entry["date"]
-            if isinstance(entry_date, pd.Timestamp):
-                entry_date = entry_date.date()
-            if entry_date not in existing_dates:
-                # Make sure to update the entry dict as well
-                entry["date"] = entry_date
-                new_records.append(
-                    EconomicIndicatorData(indicator_id=indicator_id, **entry)
-                )
-
-        session.add_all(new_records)
-        session.commit()
-        logger.info(
-            f"Inserted {len(new_records)} new records for indicator ID {indicator_id}."
+    return df.sort_values("date").reset_index(drop=True)
+
+
+def _bulk_upsert(
+    model, key_column, key_value, data, columns, required, on_conflict, batch_size
+):
+    """
+    Bulk loads rows for one series with INSERT ... ON CONFLICT on the
+    (key_column, date) unique constraint, one executemany per batch and a
+    commit after each batch.
+
+    Returns:
+        dict: Counts of 'inserted', 'updated' and 'skipped' rows.
+    """
+    if on_conflict not in ("ignore", "update"):
+        raise ValueError(f"Unknown on_conflict mode: {on_conflict}")
+
+    total_rows = len(data)
+    df = _to_load_frame(data, columns, required)
+    counts = {"inserted": 0, "updated": 0, "skipped": total_rows - len(df)}
+    if df.empty:
+        return counts
+
+    table = model.__table__
+    key = table.c[key_column]
+    value_columns = [c for c in columns if c != "date"]
+
+    stmt = sqlite_insert(table)
+    if on_conflict == "update":
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_column, "date"],
+            set_={c: stmt.excluded[c] for c in value_columns},
         )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[key_column, "date"])
+
+    session = Session()
+    try:
+        for start in range(0, len(df), batch_size):
+            batch = df.iloc[start : start + batch_size]
+            first, last = batch["date"].iloc[0], batch["date"].iloc[-1]
+
+            # Range scan on the (key, date) unique index to count conflicts
+            existing = set(
+                session.execute(
+                    select(table.c.date).where(
+                        key == key_value, table.c.date.between(first, last)
+                    )
+                ).scalars()
+            )
+            n_existing = int(batch["date"].isin(existing).sum())
+
+            records = batch.astype(object).where(batch.notna(), None)
+            records = records.to_dict(orient="records")
+            for record in records:
+                record[key_column] = key_value
+            session.execute(stmt, records)
+            session.commit()
+
+            counts["inserted"] += len(batch) - n_existing
+            if on_conflict == "update":
+                counts["updated"] += n_existing
+            else:
+                counts["skipped"] += n_existing
+        return counts
     except Exception as e:
         session.rollback()
         raise e
@@ -81,6 +152,42 @@ def save_indicator_data(indicator_id: int, data: list):
         session.close()
 
 
+def save_indicator_data(
+    indicator_id: int,
+    data,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_conflict: str = "ignore",
+):
+    """
+    Bulk loads data points for an economic indicator.
+
+    Args:
+        indicator_id (int): Primary key of the EconomicIndicator.
+        data (pd.DataFrame or list of dicts): Rows with 'date' and 'value'.
+        batch_size (int): Rows per executemany and commit.
+        on_conflict (str): "ignore" keeps already stored dates, "update" overwrites
+            their values (e.g. to pick up revisions).
+
+    Returns:
+        dict: Counts of 'inserted', 'updated' and 'skipped' rows.
+    """
+    counts = _bulk_upsert(
+        EconomicIndicatorData,
+        "indicator_id",
+        indicator_id,
+        data,
+        INDICATOR_DATA_COLUMNS,
+        ["value"],
+        on_conflict,
+        batch_size,
+    )
+    logger.info(
+        f"Inserted {counts['inserted']} new records, updated {counts['updated']}, "
+        f"skipped {counts['skipped']} for indicator ID {indicator_id}."
+    )
+    return counts
+
+
 def save_stock_index(index_data: dict):
     session = Session()
     try:
@@ -111,32 +218,40 @@ def save_stock_index(index_data: dict):
         session.close()
 
 
-def save_stock_data(index_id: int, data: list):
-    session = Session()
-    try:
-        # Fetch all existing (index_id, date) combinations
-        existing = set(
-            session.query(StockIndexData.date)
-            .filter(StockIndexData.index_id == index_id)
-            .all()
-        )
-        # Flatten from list of tuples to set of dates
-        existing_dates = {d[0] for d in existing}
+def save_stock_data(
+    index_id: int,
+    data,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_conflict: str = "ignore",
+):
+    """
+    Bulk loads daily data points for a stock index.
 
-        new_records = []
-        for entry in data:
-            entry_date = entry["date"]
-            if entry_date not in existing_dates:
-                new_records.append(StockIndexData(index_id=index_id, **entry))
+    Args:
+        index_id (int): Primary key of the StockIndex.
+        data (pd.DataFrame or list of dicts): Rows with 'date', 'close_value' and
+            optionally 'open_value', 'high_value', 'low_value' and 'volume'.
+        batch_size (int): Rows per executemany and commit.
+        on_conflict (str): "ignore" keeps already stored dates, "update" overwrites them.
 
-        session.add_all(new_records)
-        session.commit()
-        logger.info(f"Inserted {len(new_records)} new records for index ID {index_id}.")
-    except Exception as e:
-        session.rollback()
-        raise e
-    finally:
-        session.close()
+    Returns:
+        dict: Counts of 'inserted', 'updated' and 'skipped' rows.
+    """
+    counts = _bulk_upsert(
+        StockIndexData,
+        "index_id",
+        index_id,
+        data,
+        STOCK_DATA_COLUMNS,
+        ["close_value"],
+        on_conflict,
+        batch_size,
+    )
+    logger.info(
+        f"Inserted {counts['inserted']} new records, updated {counts['updated']}, "
+        f"skipped {counts['skipped']} for index ID {index_id}."
+    )
+    return counts
 
 
 def save_threshold(threshold_data: dict):
@@ -0,0 +1,91 @@
+# economic_data/scripts/ingest_stock_csv.py
+
+import argparse
+import glob
+import logging
+import os
+
+from economic_data.load.save_data import save_stock_index, save_stock_data
+from economic_data.transform.transform_stockmarket_data import (
+    read_google_finance_csv,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _expand_paths(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.csv"))))
+        else:
+            files.append(path)
+    return files
+
+
+def ingest_stock_csv(paths, source="csv", chunksize=100000, on_conflict="ignore"):
+    """
+    Bulk loads Google Finance history CSVs into stock_indices / stock_index_data.
+
+    Files (or every *.csv in a directory) are streamed in chunks; each chunk may
+    hold several tickers, which are looked up or created once via
+    save_stock_index and loaded with the bulk save_stock_data path.
+
+    Args:
+        paths (list of str): CSV files and/or directories of CSV files.
+        source (str): Source stored on newly created StockIndex rows.
+        chunksize (int): Rows read per chunk.
+        on_conflict (str): "ignore" keeps stored dates, "update" overwrites them.
+
+    Returns:
+        dict: Per ticker counts of 'inserted', 'updated' and 'skipped' rows.
+    """
+    index_ids = {}
+    totals = {}
+    for file in _expand_paths(paths):
+        for chunk in read_google_finance_csv(file, chunksize=chunksize):
+            for ticker, rows in chunk.groupby("ticker_id", sort=False):
+                if ticker not in index_ids:
+                    index_ids[ticker] = save_stock_index(
+                        {
+                            "ticker_id": ticker,
+                            "name": ticker,
+                            "description": f"Imported from {os.path.basename(file)}",
+                            "source": source,
+                        }
+                    )
+                counts = save_stock_data(
+                    index_ids[ticker], rows, on_conflict=on_conflict
+                )
+                ticker_totals = totals.setdefault(
+                    ticker, {"inserted": 0, "updated": 0, "skipped": 0}
+                )
+                for key, value in counts.items():
+                    ticker_totals[key] += value
+
+    for ticker, counts in totals.items():
+        logger.info(f"Ingested {ticker}: {counts}")
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk load Google Finance history CSVs into the database."
+    )
+    parser.add_argument("paths", nargs="+", help="CSV files or directories")
+    parser.add_argument("--source", default="csv")
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument(
+        "--update", action="store_true", help="Overwrite already stored dates"
+    )
+    args = parser.parse_args()
+
+    from logger_config import setup_logging
+
+    setup_logging(level=logging.INFO)
+    ingest_stock_csv(
+        args.paths,
+        source=args.source,
+        chunksize=args.chunksize,
+        on_conflict="update" if args.update else "ignore",
+    )
@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from economic_data.db.schema import Base
+from economic_data.db.session import create_db_engine
+from economic_data.load import load_data, save_data
+
+
+@pytest.fixture(scope="function")
+def tmp_db(tmp_path, monkeypatch):
+    """Points the load and save modules at a fresh SQLite database."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'economic_data.sqlite'}")
+    Base.metadata.create_all(engine)
+    TmpSession = sessionmaker(bind=engine)
+    monkeypatch.setattr(save_data, "Session", TmpSession)
+    monkeypatch.setattr(load_data, "Session", TmpSession)
+    yield TmpSession
+    engine.dispose()
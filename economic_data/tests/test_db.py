@@ -0,0 +1,32 @@
+import os
+
+from sqlalchemy import inspect, text
+
+from economic_data.db.create_db import create_database
+from economic_data.db.reset_db import remove_database
+from economic_data.db.session import create_db_engine
+
+
+def test_create_db_engine_applies_profile_pragmas(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'db.sqlite'}", profile="default")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    engine.dispose()
+
+
+def test_create_and_remove_database_use_configured_url(tmp_path):
+    db_file = tmp_path / "nested" / "economic_data.sqlite"
+    db_url = f"sqlite:///{db_file}"
+
+    create_database(db_url)
+    engine = create_db_engine(db_url)
+    assert "economic_indicator_data" in inspect(engine).get_table_names()
+    engine.dispose()
+
+    remove_database(db_url)
+    assert not any(
+        os.path.exists(f"{db_file}{suffix}") for suffix in ("", "-wal", "-shm")
+    )
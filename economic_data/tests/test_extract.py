@@ -0,0 +1,233 @@
+import datetime
+import json
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from economic_data.extract import economic_data
+from economic_data.extract.economic_data import fetch_concurrently
+from economic_data.extract.http_client import HttpClient, TokenBucket
+from economic_data.extract.response_cache import ResponseCache, normalize_cache_key
+
+
+def test_fetch_concurrently_returns_payloads_keyed_by_series():
+    def fetch(value, scale=1):
+        return {"value": value * scale}
+
+    results = fetch_concurrently(
+        {
+            "a": (fetch, (1,)),
+            "b": (fetch, (2,), {"scale": 10}),
+        },
+        max_workers=2,
+    )
+    assert list(results) == ["a", "b"]
+    assert results["a"] == {"value": 1}
+    assert results["b"] == {"value": 20}
+
+
+def test_fetch_concurrently_isolates_failures():
+    def fail():
+        raise RuntimeError("boom")
+
+    results = fetch_concurrently(
+        {"bad": (fail, ()), "good": (lambda: {"ok": True}, ())}
+    )
+    assert results["bad"] is None
+    assert results["good"] == {"ok": True}
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=50, capacity=2, clock=lambda: now[0], sleep=sleep)
+    bucket.acquire()
+    bucket.acquire()
+    assert sleeps == []
+    bucket.acquire()
+    assert sleeps == [pytest.approx(0.02)]
+
+
+def test_http_client_charges_rate_limit_for_retries():
+    statuses = [503, 429, 200]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(statuses.pop(0))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    class CountingBucket:
+        acquired = 0
+
+        def acquire(self, tokens=1):
+            CountingBucket.acquired += tokens
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = HttpClient(backoff_factor=0, backoff_jitter=0)
+    client._buckets["127.0.0.1"] = CountingBucket()
+    try:
+        response = client.get(f"http://127.0.0.1:{server.server_port}/data")
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == 200
+    # one token for the request and one per retry
+    assert CountingBucket.acquired == 3
+
+
+class _FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _FakeClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+def test_normalize_cache_key_strips_api_key_and_sorts_query():
+    key = normalize_cache_key(
+        "https://API.stlouisfed.org/fred/series/observations"
+        "?series_id=DFF&api_key=secret&file_type=json"
+    )
+    assert "secret" not in key
+    assert key == (
+        "https://api.stlouisfed.org/fred/series/observations"
+        "?file_type=json&series_id=DFF"
+    )
+
+
+def test_fetch_json_revalidates_with_etag(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    client = _FakeClient(
+        [
+            _FakeResponse(200, b'{"value": 1}', {"ETag": '"v1"'}),
+            _FakeResponse(304),
+        ]
+    )
+    monkeypatch.setattr(economic_data, "get_http_client", lambda: client)
+
+    url = "https://example.org/data?api_key=secret"
+    assert economic_data.fetch_json(url, cache=cache) == {"value": 1}
+    assert economic_data.fetch_json(url, cache=cache) == {"value": 1}
+    assert client.requests[1]["If-None-Match"] == '"v1"'
+
+
+def test_fetch_json_offline_serves_only_from_cache(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), offline=True)
+    cache.put(normalize_cache_key("https://example.org/a"), b'{"cached": true}')
+    monkeypatch.setattr(economic_data, "get_http_client", lambda: _FakeClient([]))
+
+    assert economic_data.fetch_json("https://example.org/a", cache=cache) == {
+        "cached": True
+    }
+    assert economic_data.fetch_json("https://example.org/b", cache=cache) is None
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=10)
+    cache.put("a", b"123456")
+    cache.put("b", b"123456")
+    assert cache.get("a") is None
+    assert cache.get("b")["body"] == b"123456"
+
+
+def test_incremental_from_date_applies_overlap_and_lower_bound():
+    assert economic_data.incremental_from_date("2020-01-01") == "2020-01-01"
+    assert (
+        economic_data.incremental_from_date("2020-01-01", "2024-05-31", 31)
+        == "2024-04-30"
+    )
+    assert (
+        economic_data.incremental_from_date("2020-01-01", "2020-01-15", 62)
+        == "2020-01-01"
+    )
+
+
+def test_incremental_start_dates_per_symbol():
+    latest = {"INDEXNASDAQ:OMXSPI": datetime.date(2024, 6, 14)}
+
+    start_dates = economic_data.incremental_start_dates(
+        ["INDEXNASDAQ:OMXSPI", "INDEXSP:.INX"], "2018-01-01", latest, 5
+    )
+
+    assert start_dates == {
+        "INDEXNASDAQ:OMXSPI": "2024-06-09",
+        "INDEXSP:.INX": "2018-01-01",
+    }
+
+
+def test_fetch_fred_json_pushes_date_range_down(monkeypatch):
+    urls = []
+    monkeypatch.setattr(economic_data, "fetch_json", lambda url: urls.append(url))
+
+    economic_data.fetch_fred_json("DFF", "secret", "2024-01-01", "2024-06-30")
+    economic_data.fetch_fred_json("DFF", "secret", "2024-01-01", "")
+
+    assert "observation_start=2024-01-01" in urls[0]
+    assert "observation_end=2024-06-30" in urls[0]
+    assert "observation_end" not in urls[1]
+
+
+def test_fetch_eurostat_json_builds_multi_geo_query(monkeypatch):
+    urls = []
+    monkeypatch.setattr(economic_data, "fetch_json", lambda url: urls.append(url))
+
+    economic_data.fetch_eurostat_json("prc_hicp_mmor", "2024-01-01")
+    economic_data.fetch_eurostat_json(
+        "ei_lmhr_m", "2024-01-01", geo=["SE", "DE"], filters={"s_adj": "SA"}
+    )
+    economic_data.fetch_eurostat_json("ei_lmhr_m", "2024-01-01", geo=None)
+
+    assert urls[0].endswith(
+        "prc_hicp_mmor?geo=EU27_2020&sinceTimePeriod=2024-01&format=JSON"
+    )
+    assert "?geo=SE&geo=DE&s_adj=SA&sinceTimePeriod=2024-01" in urls[1]
+    assert "geo=" not in urls[2]
+
+
+def test_response_cache_closes_its_connections(tmp_path, monkeypatch):
+    connections = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.put("a", b"body")
+    assert cache.get("a")["body"] == b"body"
+
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
@@ -0,0 +1,71 @@
+import os
+
+import pandas as pd
+
+from economic_data.db.schema import StockIndex, StockIndexData
+from economic_data.scripts.ingest_stock_csv import ingest_stock_csv
+from economic_data.transform.transform_stockmarket_data import (
+    google_finance_data_to_df,
+    read_google_finance_csv,
+)
+
+INPUT_DATA = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "input_data")
+
+CSV = """Ticker_id,Date,Open,High,Low,Close,Volume
+INDEXSP:.INX,2018-01-02 16.00.00,"2683,73","2695,89","2682,36","2695,81",0
+INDEXNASDAQ:OMXSPI,2018-01-02 16.00.00,"569,51","570,79","567,46","569,8",n/a
+INDEXSP:.INX,2018-01-03 16.00.00,"2697,85","2714,37","2697,77","2713,06",12
+"""
+
+
+def test_read_google_finance_csv_parses_decimal_commas(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    chunks = list(read_google_finance_csv(str(path), chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    first = chunks[0].iloc[1]
+    assert first["date"] == pd.Timestamp(2018, 1, 2)
+    assert first["close_value"] == 569.8
+    assert first["volume"] == 0
+    assert chunks[1].iloc[0]["volume"] == 12
+
+
+def test_ingest_stock_csv_loads_directory_of_files(tmp_db):
+    totals = ingest_stock_csv([INPUT_DATA], chunksize=500)
+    assert set(totals) == {"INDEXNASDAQ:OMXSPI", "INDEXSP:.INX"}
+    assert all(counts["inserted"] > 1000 for counts in totals.values())
+
+    again = ingest_stock_csv([INPUT_DATA])
+    assert all(counts["inserted"] == 0 for counts in again.values())
+
+    session = tmp_db()
+    assert session.query(StockIndex).count() == 2
+    assert session.query(StockIndexData).count() == sum(
+        counts["inserted"] for counts in totals.values()
+    )
+    session.close()
+
+
+def test_csv_and_sheet_readers_return_the_same_dtypes(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text(CSV, encoding="utf-8")
+    rows = [line.split(",") for line in CSV.splitlines()[:1]] + [
+        [
+            "INDEXSP:.INX",
+            "2018-01-02 16.00.00",
+            "2683,73",
+            "2695,89",
+            "2682,36",
+            "2695,81",
+            "0",
+        ]
+    ]
+
+    from_csv = next(read_google_finance_csv(str(path)))
+    from_sheet = google_finance_data_to_df(rows)
+
+    columns = [c for c in from_sheet.columns if c in from_csv.columns]
+    assert from_csv[columns].dtypes.to_dict() == from_sheet[columns].dtypes.to_dict()
+    assert from_csv["date"].iloc[0] == from_sheet["date"].iloc[0]
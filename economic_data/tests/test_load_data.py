@@ -73,3 +73,99 @@ def test_get_thresholds_for_indicator():
     thresholds = get_thresholds_for_indicator(indicator_id)
     assert len(thresholds) > 0
     assert thresholds[0].good_min == 2.0
+
+
+def test_get_indicator_frame_is_columnar_and_sorted(tmp_db):
+    import pandas as pd
+
+    from economic_data.load.load_data import get_indicator_frame
+
+    indicator_id = save_indicator(
+        {"indicator_id": "UNRATE", "name": "unemployment_monthly_rate_us"}
+    )
+    save_indicator_data(
+        indicator_id,
+        [
+            {"date": "2024-02-01", "value": 3.9},
+            {"date": "2024-01-01", "value": 3.7},
+        ],
+    )
+
+    df = get_indicator_frame(indicator_id)
+    assert list(df.columns) == ["date", "value"]
+    assert df["date"].dtype == "datetime64[ns]"
+    assert df["value"].dtype == "float64"
+    assert list(df["value"]) == [3.7, 3.9]
+
+
+def test_get_stock_frame_projects_columns(tmp_db):
+    from economic_data.load.load_data import get_stock_frame
+
+    index_id = save_stock_index({"ticker_id": "INDEXSP:.INX", "name": "sp500"})
+    save_stock_data(
+        index_id,
+        [
+            {"date": "2024-01-02", "close_value": 4742.83, "volume": 0},
+            {"date": "2024-01-03", "close_value": 4704.81, "volume": 0},
+        ],
+    )
+
+    df = get_stock_frame(index_id, columns=["date", "close_value"])
+    assert list(df.columns) == ["date", "close_value"]
+    assert list(df["close_value"]) == [4742.83, 4704.81]
+
+
+def test_get_indicator_data_many_filters_ids_and_dates(tmp_db):
+    from economic_data.load.load_data import get_indicator_data_many
+
+    ids = []
+    for code in ("UNRATE", "CPIAUCSL", "DFF"):
+        indicator_id = save_indicator({"indicator_id": code, "name": code})
+        save_indicator_data(
+            indicator_id,
+            [
+                {"date": "2023-12-01", "value": 1.0},
+                {"date": "2024-01-01", "value": 2.0},
+                {"date": "2024-02-01", "value": 3.0},
+            ],
+        )
+        ids.append(indicator_id)
+
+    long_df = get_indicator_data_many(ids[:2], start="2024-01-01")
+    assert list(long_df.columns) == ["indicator_id", "date", "value"]
+    assert list(long_df["indicator_id"]) == [ids[0], ids[0], ids[1], ids[1]]
+
+    wide_df = get_indicator_data_many(ids, end="2024-01-31", wide=True)
+    assert list(wide_df.columns) == ids
+    assert wide_df.shape == (2, 3)
+
+
+def test_get_stock_data_many_wide_close_values(tmp_db):
+    from economic_data.load.load_data import get_stock_data_many
+
+    ids = []
+    for ticker, close in (("INDEXSP:.INX", 4700.0), ("INDEXNASDAQ:OMXSPI", 950.0)):
+        index_id = save_stock_index({"ticker_id": ticker, "name": ticker})
+        save_stock_data(index_id, [{"date": "2024-01-02", "close_value": close}])
+        ids.append(index_id)
+
+    wide_df = get_stock_data_many(ids, start="2024-01-01", wide=True)
+    assert wide_df.loc["2024-01-02"].tolist() == [4700.0, 950.0]
+
+
+def test_iter_stock_data_streams_bounded_chunks(tmp_db):
+    import pandas as pd
+
+    from economic_data.load.load_data import iter_stock_data
+
+    index_id = save_stock_index({"ticker_id": "INDEXSP:.INX", "name": "sp500"})
+    dates = pd.date_range("2024-01-01", periods=7)
+    save_stock_data(index_id, pd.DataFrame({"date": dates, "close_value": range(7)}))
+
+    chunks = list(iter_stock_data([index_id], columns=["close_value"], chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert list(chunks[0].columns) == ["index_id", "date", "close_value"]
+    assert pd.concat(chunks)["date"].tolist() == list(dates)
+
+    rows = next(iter_stock_data(chunk_size=2, as_frames=False))
+    assert len(rows) == 2 and rows[0][0] == index_id
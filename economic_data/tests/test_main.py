@@ -0,0 +1,81 @@
+import importlib
+import sys
+
+import pytest
+
+CONFIG = """
+[API_KEYS]
+FRED = test
+[DATE_RANGE]
+FROM_DATE = 2024-01-01
+TO_DATE = 2024-03-31
+[FILES]
+ECONOMIC_THRESHOLDS = thresholds.csv
+[GOOGLE_HISTORICAL_DATA]
+API_KEY_FILE = service_account.json
+ID = sheet
+"""
+
+
+@pytest.fixture
+def main_module(tmp_path, monkeypatch):
+    """Imports main with a minimal config in a temporary working directory."""
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.ini").write_text(CONFIG)
+    monkeypatch.chdir(tmp_path)
+    sys.modules.pop("main", None)
+    module = importlib.import_module("main")
+    yield module
+    sys.modules.pop("main", None)
+
+
+def _hicp_cube():
+    # 3 COICOP categories x 3 months, returned even when a coicop filter is passed
+    coicops = ["CP00", "CP01", "CP02"]
+    periods = ["2024-01", "2024-02", "2024-03"]
+    return {
+        "label": "HICP - monthly rate of change",
+        "source": "Eurostat",
+        "id": ["freq", "unit", "coicop", "geo", "time"],
+        "size": [1, 1, len(coicops), 1, len(periods)],
+        "dimension": {
+            "freq": {"category": {"index": {"M": 0}, "label": {"M": "Monthly"}}},
+            "unit": {"category": {"index": {"RCH_M": 0}}},
+            "coicop": {"category": {"index": {c: i for i, c in enumerate(coicops)}}},
+            "geo": {"category": {"index": {"EU27_2020": 0}}},
+            "time": {"category": {"index": {p: i for i, p in enumerate(periods)}}},
+        },
+        "value": {str(i): float(i) for i in range(len(coicops) * len(periods))},
+    }
+
+
+class _Saved(Exception):
+    """Stops main once the HICP rows reached the load step."""
+
+
+def test_main_saves_only_all_items_hicp(main_module, monkeypatch):
+    requested = {}
+    saved = {}
+
+    def fake_save_indicator_data(indicator_id, data, **kwargs):
+        saved[indicator_id] = data
+        raise _Saved
+
+    def fake_eurostat(data_code, from_date, geo="EU27_2020", filters=None):
+        requested[data_code] = filters
+        return _hicp_cube() if data_code == "prc_hicp_mmor" else None
+
+    monkeypatch.setattr(main_module, "fetch_eurostat_json", fake_eurostat)
+    monkeypatch.setattr(main_module, "fetch_ecb_json", lambda *args: None)
+    monkeypatch.setattr(main_module, "fetch_fred_json", lambda *args: None)
+    monkeypatch.setattr(main_module, "fetch_stock_histories", lambda *args: {})
+    monkeypatch.setattr(main_module, "load_threshold_rules", lambda file: None)
+    monkeypatch.setattr(main_module, "save_indicator", lambda indicator: 1)
+    monkeypatch.setattr(main_module, "save_indicator_data", fake_save_indicator_data)
+
+    with pytest.raises(_Saved):
+        main_module.main()
+
+    assert requested["prc_hicp_mmor"] == {"coicop": "CP00"}
+    assert [row["value"] for row in saved[1]] == [0.0, 1.0, 2.0]
+    assert all(set(row) == {"date", "value"} for row in saved[1])
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from economic_data.load import parquet_archive
+from economic_data.load.parquet_archive import (
+    latest_archived_dates,
+    read_archive,
+    sync_indicator_archive,
+    sync_stock_archive,
+)
+from economic_data.load.save_data import (
+    save_indicator,
+    save_indicator_data,
+    save_stock_index,
+    save_stock_data,
+)
+
+
+def test_sync_indicator_archive_appends_only_new_rows(tmp_db, tmp_path):
+    root = str(tmp_path / "archive")
+    indicator_id = save_indicator(
+        {"indicator_id": "UNRATE", "name": "unemployment", "source": "FRED"}
+    )
+    save_indicator_data(
+        indicator_id,
+        [{"date": "2023-12-01", "value": 3.7}, {"date": "2024-01-01", "value": 3.7}],
+    )
+    assert sync_indicator_archive(root) == 2
+
+    save_indicator_data(indicator_id, [{"date": "2024-02-01", "value": 3.9}])
+    assert sync_indicator_archive(root) == 1
+    assert sync_indicator_archive(root) == 0
+
+    df = read_archive("indicators", root, series=["UNRATE"], start="2024-01-01")
+    assert df["date"].tolist() == list(pd.to_datetime(["2024-01-01", "2024-02-01"]))
+    assert df["source"].unique().tolist() == ["FRED"]
+    assert latest_archived_dates("indicators", root) == {
+        "UNRATE": pd.Timestamp("2024-02-01")
+    }
+
+
+def test_read_archive_prunes_by_series_and_date(tmp_db, tmp_path):
+    root = str(tmp_path / "archive")
+    for ticker in ("INDEXSP:.INX", "INDEXNASDAQ:OMXSPI"):
+        index_id = save_stock_index(
+            {"ticker_id": ticker, "name": ticker, "source": "google spreadsheet"}
+        )
+        save_stock_data(
+            index_id,
+            pd.DataFrame(
+                {
+                    "date": pd.to_datetime(["2023-12-29", "2024-01-02"]),
+                    "close_value": [1.0, 2.0],
+                }
+            ),
+        )
+    assert sync_stock_archive(root) == 4
+
+    df = read_archive(
+        "stocks",
+        root,
+        series=["INDEXNASDAQ:OMXSPI"],
+        end="2023-12-31",
+        columns=["series", "date", "close_value"],
+    )
+    assert df["series"].tolist() == ["INDEXNASDAQ:OMXSPI"]
+    assert df["close_value"].tolist() == [1.0]
+
+
+def test_sync_compacts_partitions_above_threshold_and_reads_manifest(
+    tmp_db, tmp_path, monkeypatch
+):
+    root = tmp_path / "archive"
+    monkeypatch.setattr(parquet_archive, "COMPACT_MIN_FILES", 3)
+    indicator_id = save_indicator(
+        {"indicator_id": "UNRATE", "name": "unemployment", "source": "FRED"}
+    )
+
+    def sync(date):
+        save_indicator_data(indicator_id, [{"date": date, "value": 3.8}])
+        sync_indicator_archive(str(root))
+        return len(list((root / "indicators").rglob("*.parquet")))
+
+    # small partitions are left alone until they reach the threshold
+    assert [sync(d) for d in ("2024-01-01", "2024-02-01", "2024-03-01")] == [1, 2, 1]
+    sync("2024-04-01")
+    assert parquet_archive.compact_archive("indicators", str(root)) == 1
+    assert len(list((root / "indicators").rglob("*.parquet"))) == 1
+    monkeypatch.setattr(
+        parquet_archive,
+        "read_archive",
+        lambda *args, **kwargs: pytest.fail("archive scanned for high-water marks"),
+    )
+    assert latest_archived_dates("indicators", str(root)) == {
+        "UNRATE": pd.Timestamp("2024-04-01")
+    }
+    assert sync_indicator_archive(str(root)) == 0
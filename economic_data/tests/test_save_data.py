@@ -109,3 +109,83 @@ def test_save_threshold(db_session):
     }
     threshold_id = save_threshold(threshold_data)
     assert threshold_id is not None
+
+
+def test_save_indicator_data_bulk_counts(tmp_db):
+    import pandas as pd
+
+    indicator_id = save_indicator(
+        {"indicator_id": "prc_hicp_mmor", "name": "inflation_monthly_euro"}
+    )
+    first = pd.DataFrame(
+        {"date": pd.to_datetime(["2024-01-01", "2024-02-01"]), "value": [0.3, 0.4]}
+    )
+    assert save_indicator_data(indicator_id, first, batch_size=1) == {
+        "inserted": 2,
+        "updated": 0,
+        "skipped": 0,
+    }
+
+    revised = pd.DataFrame(
+        {
+            "date": ["2024-02-01", "2024-03-01", "2024-04-01"],
+            "value": [0.5, 0.6, None],
+        }
+    )
+    assert save_indicator_data(indicator_id, revised) == {
+        "inserted": 1,
+        "updated": 0,
+        "skipped": 2,
+    }
+    assert save_indicator_data(indicator_id, revised, on_conflict="update") == {
+        "inserted": 0,
+        "updated": 2,
+        "skipped": 1,
+    }
+
+    session = tmp_db()
+    values = [
+        row.value
+        for row in session.query(EconomicIndicatorData)
+        .filter_by(indicator_id=indicator_id)
+        .order_by(EconomicIndicatorData.date)
+    ]
+    session.close()
+    assert values == [0.3, 0.5, 0.6]
+
+
+def test_save_indicator_data_rejects_duplicate_dates(tmp_db):
+    indicator_id = save_indicator(
+        {"indicator_id": "prc_hicp_mmor", "name": "inflation_monthly_euro"}
+    )
+    mixed = [
+        {"date": "2024-01-01", "value": 0.3},
+        {"date": "2024-01-01", "value": 1.2},
+        {"date": "2024-02-01", "value": 0.4},
+    ]
+    with pytest.raises(ValueError, match="more than once"):
+        save_indicator_data(indicator_id, mixed)
+
+    session = tmp_db()
+    assert session.query(EconomicIndicatorData).count() == 0
+    session.close()
+
+
+def test_save_stock_data_accepts_list_of_dicts(tmp_db):
+    from datetime import date
+
+    from economic_data.db.schema import StockIndexData
+
+    index_id = save_stock_index({"ticker_id": "INDEXNASDAQ:OMXSPI", "name": "omx_smi"})
+    counts = save_stock_data(
+        index_id,
+        [
+            {"date": date(2024, 1, 2), "close_value": 900.0, "volume": 0},
+            {"date": date(2024, 1, 3), "close_value": 905.5, "volume": 0},
+        ],
+    )
+    assert counts["inserted"] == 2
+
+    session = tmp_db()
+    assert session.query(StockIndexData).filter_by(index_id=index_id).count() == 2
+    session.close()
@@ -0,0 +1,143 @@
+from economic_data.extract import economic_data
+from economic_data.extract.sheets_client import SheetClient
+from economic_data.transform.transform_stockmarket_data import (
+    google_finance_data_to_df,
+)
+
+
+class _FakeWorksheet:
+    def __init__(self, calls, values=None):
+        self.calls = calls
+        self.values = values or []
+
+    def batch_update(self, data, value_input_option=None):
+        self.calls.append(("batch_update", data))
+
+    def get(self, range_name, value_render_option=None):
+        self.calls.append(("get", range_name, str(value_render_option)))
+        return self.values
+
+
+class _FakeSpreadsheet:
+    def __init__(self, calls, worksheets):
+        self.calls = calls
+        self.worksheets = worksheets
+
+    def worksheet(self, title):
+        self.calls.append(("worksheet", title))
+        return self.worksheets[title]
+
+
+class _FakeGspreadClient:
+    def __init__(self, values, worker_sheets=(("Data", "output"),)):
+        self.calls = []
+        worksheets = {}
+        for control_sheet, output_sheet in worker_sheets:
+            worksheets[control_sheet] = _FakeWorksheet(self.calls)
+            worksheets[output_sheet] = _FakeWorksheet(self.calls, values)
+        self.spreadsheet = _FakeSpreadsheet(self.calls, worksheets)
+
+    def open_by_key(self, key):
+        self.calls.append(("open_by_key", key))
+        return self.spreadsheet
+
+
+OUTPUT_VALUES = [
+    ["Ticker_id", "Date", "Open", "High", "Low", "Close", "Volume"],
+    ["INDEXNASDAQ:OMXSPI", 43102.666666666664, 569.51, 570.79, 567.46, 569.8, 0],
+    ["INDEXNASDAQ:OMXSPI", 43103.666666666664, 571.04, 574.31, 570.21, 573.6],
+]
+
+
+def test_sheet_client_uses_two_calls_per_symbol():
+    gc = _FakeGspreadClient(OUTPUT_VALUES)
+    client = SheetClient(gc, "sheet-id", max_rows=500)
+
+    client.fetch("INDEXNASDAQ:OMXSPI", "2018-01-01")
+    gc.calls.clear()
+    data = client.fetch("INDEXSP:.INX", "2018-01-01")
+
+    assert data == OUTPUT_VALUES
+    assert gc.calls == [
+        (
+            "batch_update",
+            [{"range": "B1:B2", "values": [["INDEXSP:.INX"], ["2018-01-01"]]}],
+        ),
+        ("get", "A1:G501", "UNFORMATTED_VALUE"),
+    ]
+
+
+def test_google_finance_data_to_df_reads_serial_dates_and_short_rows():
+    df = google_finance_data_to_df(OUTPUT_VALUES)
+
+    assert df["date"].dt.strftime("%Y-%m-%d").tolist() == ["2018-01-02", "2018-01-03"]
+    assert df["close_value"].tolist() == [569.8, 573.6]
+    assert df["volume"].tolist() == [0, 0]
+
+
+def test_get_historical_stock_data_many_spreads_symbols_over_worker_sheets(
+    monkeypatch,
+):
+    worker_sheets = [("Data", "output"), ("Data2", "output2")]
+    gc = _FakeGspreadClient(OUTPUT_VALUES, worker_sheets)
+    monkeypatch.setattr(economic_data, "get_gspread_client", lambda file: gc)
+    symbols = ["INDEXNASDAQ:OMXSPI", "INDEXSP:.INX", "INDEXDJX:.DJI"]
+
+    results = dict(
+        economic_data.get_historical_stock_data_many(
+            symbols,
+            "service_account.json",
+            "sheet-id",
+            start_date={"INDEXSP:.INX": "2024-01-01"},
+            worker_sheets=worker_sheets,
+            requests_per_minute=6000,
+        )
+    )
+
+    assert sorted(results) == sorted(symbols)
+    assert all(data == OUTPUT_VALUES for data in results.values())
+    updates = [call[1][0]["values"] for call in gc.calls if call[0] == "batch_update"]
+    start_dates = [values[1] for values in updates]
+    assert start_dates.count(["2024-01-01"]) == 1
+    assert start_dates.count([economic_data.DEFAULT_STOCK_START_DATE]) == 2
+    assert len(updates) == len(symbols)
+
+
+def test_get_historical_stock_data_many_survives_missing_worker_sheets(monkeypatch):
+    gc = _FakeGspreadClient(OUTPUT_VALUES)
+    monkeypatch.setattr(economic_data, "get_gspread_client", lambda file: gc)
+    monkeypatch.setattr(economic_data, "RESULT_POLL_SECONDS", 0.01)
+    symbols = ["INDEXNASDAQ:OMXSPI", "INDEXSP:.INX"]
+
+    def fetch(worker_sheets):
+        return dict(
+            economic_data.get_historical_stock_data_many(
+                symbols,
+                "service_account.json",
+                "sheet-id",
+                worker_sheets=worker_sheets,
+                requests_per_minute=6000,
+            )
+        )
+
+    # the missing pair exits, the healthy one fetches every symbol
+    assert fetch([("Missing", "missing"), ("Data", "output")]) == {
+        symbol: OUTPUT_VALUES for symbol in symbols
+    }
+    assert fetch([("Missing", "missing")]) == {symbol: [] for symbol in symbols}
+
+
+def test_get_historical_stock_data_many_stops_workers_when_closed(monkeypatch):
+    gc = _FakeGspreadClient(OUTPUT_VALUES)
+    monkeypatch.setattr(economic_data, "get_gspread_client", lambda file: gc)
+    symbols = [f"SYMBOL{i}" for i in range(50)]
+
+    results = economic_data.get_historical_stock_data_many(
+        symbols, "service_account.json", "sheet-id", requests_per_minute=60000
+    )
+    next(results)
+    results.close()
+
+    # the worker finishes at most the symbol it was fetching when closed
+    fetched = [call for call in gc.calls if call[0] == "batch_update"]
+    assert len(fetched) < len(symbols)
@@ -0,0 +1,534 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from economic_data.transform.transform_economic_data import (
+    concat_panel,
+    ecb_json_to_df,
+    ecb_json_to_long_df,
+    eurostat_json_to_df,
+    eurostat_json_to_long_df,
+    fred_json_to_df,
+    label_and_append,
+    load_threshold_rules,
+    load_thresholds,
+    rename_economic_indicators,
+    set_monthly_ecb_interest_rate,
+    threshold_csv_to_df,
+)
+from economic_data.transform.derived_series import (
+    Derivation,
+    append_derived_series,
+    compute_derived_series,
+)
+from economic_data.transform.frequency_alignment import align_frequency
+from economic_data.transform import transform_cache
+from economic_data.transform.transform_cache import (
+    TransformCache,
+    memoize_transform,
+    payload_fingerprint,
+)
+from economic_data.transform import transform_economic_data
+
+
+def _eurostat_json(values, periods=("2024-01", "2024-02", "2024-03")):
+    return {
+        "label": "HICP - monthly data (monthly rate of change)",
+        "source": "ESTAT",
+        "id": ["freq", "unit", "coicop", "geo", "time"],
+        "size": [1, 1, 1, 1, len(periods)],
+        "dimension": {
+            "freq": {"category": {"index": {"M": 0}, "label": {"M": "Monthly"}}},
+            "unit": {"category": {"index": {"RCH_M": 0}}},
+            "coicop": {"category": {"index": {"CP00": 0}}},
+            "geo": {"category": {"index": {"EU27_2020": 0}}},
+            "time": {"category": {"index": {p: i for i, p in enumerate(periods)}}},
+        },
+        "value": values,
+    }
+
+
+def test_eurostat_json_to_df_skips_missing_periods():
+    df = eurostat_json_to_df(_eurostat_json({"2": 0.4, "0": 0.3}), "prc_hicp_mmor")
+
+    assert list(df["date"]) == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-01")]
+    np.testing.assert_allclose(df["value"], [0.3, 0.4])
+
+
+def test_eurostat_json_to_df_parses_quarterly_periods():
+    data_json = _eurostat_json({"0": 1.0, "1": 2.0}, periods=("2023-Q4", "2024-Q1"))
+    df = eurostat_json_to_df(data_json, "namq_10_gdp")
+
+    assert list(df["date"]) == [pd.Timestamp("2023-10-01"), pd.Timestamp("2024-01-01")]
+
+
+def test_eurostat_json_to_df_returns_none_on_malformed_payload():
+    assert eurostat_json_to_df({"value": {}}, "broken") is None
+
+
+def _eurostat_cube_json():
+    # 2 geos x 2 s_adj x 3 periods, flat index = geo * 6 + s_adj * 3 + time
+    return {
+        "id": ["freq", "geo", "s_adj", "time"],
+        "size": [1, 2, 2, 3],
+        "dimension": {
+            "freq": {"category": {"index": {"M": 0}}},
+            "geo": {"category": {"index": {"SE": 0, "DE": 1}}},
+            "s_adj": {"category": {"index": {"NSA": 0, "SA": 1}}},
+            "time": {"category": {"index": {"2024-01": 0, "2024-02": 1, "2024-03": 2}}},
+        },
+        "value": {"0": 8.0, "4": 8.1, "6": 3.0, "11": 3.2},
+    }
+
+
+def test_eurostat_json_to_long_df_decodes_every_dimension():
+    df = eurostat_json_to_long_df(_eurostat_cube_json(), "ei_lmhr_m")
+
+    assert list(df.columns) == ["freq", "geo", "s_adj", "date", "value"]
+    assert list(df["geo"]) == ["SE", "SE", "DE", "DE"]
+    assert list(df["s_adj"]) == ["NSA", "SA", "NSA", "SA"]
+    assert list(df["date"].dt.strftime("%Y-%m")) == [
+        "2024-01",
+        "2024-02",
+        "2024-01",
+        "2024-03",
+    ]
+    np.testing.assert_allclose(df["value"], [8.0, 8.1, 3.0, 3.2])
+
+
+def test_eurostat_json_to_df_keeps_varying_dimensions():
+    df = eurostat_json_to_df(
+        _eurostat_cube_json(), "ei_lmhr_m", allow_multiple_series=True
+    )
+
+    assert list(df.columns) == ["date", "value", "geo", "s_adj"]
+
+
+def _multi_coicop_json():
+    data_json = _eurostat_json(
+        {str(i): float(i) for i in range(9)}, periods=("2024-01", "2024-02", "2024-03")
+    )
+    data_json["size"] = [1, 1, 3, 1, 3]
+    data_json["dimension"]["coicop"] = {
+        "category": {"index": {"CP00": 0, "CP01": 1, "CP02": 2}}
+    }
+    return data_json
+
+
+def test_eurostat_json_to_df_does_not_mix_series():
+    with pytest.raises(ValueError, match="coicop"):
+        eurostat_json_to_df(_multi_coicop_json(), "prc_hicp_mmor")
+
+    df = eurostat_json_to_df(
+        _multi_coicop_json(), "prc_hicp_mmor", selection={"coicop": "CP00"}
+    )
+    assert list(df.columns) == ["date", "value"]
+    np.testing.assert_allclose(df["value"], [0.0, 1.0, 2.0])
+
+
+def _ecb_json(series):
+    return {
+        "structure": {
+            "dimensions": {
+                "series": [
+                    {"id": "FREQ", "values": [{"id": "B"}]},
+                    {
+                        "id": "PROVIDER_FM_ID",
+                        "values": [{"id": "MRR_FR"}, {"id": "DFR"}],
+                    },
+                ],
+                "observation": [
+                    {
+                        "id": "TIME_PERIOD",
+                        "values": [
+                            {"id": "2023-09-20"},
+                            {"id": "2024-06-12"},
+                            {"id": "2024-09-18"},
+                        ],
+                    }
+                ],
+            }
+        },
+        "dataSets": [{"series": series}],
+    }
+
+
+def test_ecb_json_to_long_df_decodes_all_series():
+    data_json = _ecb_json(
+        {
+            "0:0": {"observations": {"0": [4.5, 0], "1": [4.25, 0]}},
+            "0:1": {"observations": {"0": [4.0, 0], "2": [3.5, 0], "1": [None, 0]}},
+        }
+    )
+    df = ecb_json_to_long_df(data_json, "FM", "B.U2.EUR.4F.KR.MRR_FR+DFR.LEV")
+
+    assert list(df["PROVIDER_FM_ID"]) == ["MRR_FR", "MRR_FR", "DFR", "DFR"]
+    assert list(df["date"]) == list(
+        pd.to_datetime(["2023-09-20", "2024-06-12", "2023-09-20", "2024-09-18"])
+    )
+    np.testing.assert_allclose(df["value"], [4.5, 4.25, 4.0, 3.5])
+
+
+def test_ecb_json_to_df_single_series_has_date_and_value_only():
+    data_json = _ecb_json({"0:0": {"observations": {"1": [4.25, 0], "0": [4.5, 0]}}})
+    df = ecb_json_to_df(data_json, "FM", "B.U2.EUR.4F.KR.MRR_FR.LEV")
+
+    assert list(df.columns) == ["date", "value"]
+    np.testing.assert_allclose(df["value"], [4.5, 4.25])
+
+
+def test_fred_json_to_df_drops_missing_sentinel_and_filters_from_date():
+    data_json = {
+        "observations": [
+            {"date": "2023-12-01", "value": "5.33"},
+            {"date": "2024-01-01", "value": "5.33"},
+            {"date": "2024-02-01", "value": "."},
+            {"date": "2024-03-01", "value": "5.31"},
+        ]
+    }
+    df = fred_json_to_df(data_json, "2024-01-01")
+
+    assert list(df["date"]) == list(pd.to_datetime(["2024-01-01", "2024-03-01"]))
+    np.testing.assert_allclose(df["value"], [5.33, 5.31])
+    assert len(fred_json_to_df(data_json)) == 3
+
+
+THRESHOLDS_CSV = """indicator,good_range,medium_range,bad_range
+inflation_monthly_euro,0.0% – 0.2% or 0.4% – 0.8%,0.2% – 0.4%,< 0.0% or > 0.8%
+unemployment_rate_monthly_euro,< 5%,5% – 7%,> 7%
+"""
+
+
+def _reference_score(value, indicator, thresholds_df):
+    # Row-by-row first-match scorer the vectorized engine must agree with
+    for _, row in thresholds_df[thresholds_df["indicator"] == indicator].iterrows():
+        lower_ok = (
+            value >= row["min_val"] if row["inclusive_min"] else value > row["min_val"]
+        )
+        upper_ok = (
+            value <= row["max_val"] if row["inclusive_max"] else value < row["max_val"]
+        )
+        if lower_ok and upper_ok:
+            return row["score"]
+    return None
+
+
+def test_load_thresholds_matches_first_match_semantics(tmp_path):
+    threshold_file = tmp_path / "thresholds.csv"
+    threshold_file.write_text(THRESHOLDS_CSV, encoding="utf-8")
+    thresholds_df = threshold_csv_to_df(threshold_file)
+
+    values = [-0.1, 0.0, 0.1, 0.2, 0.3, 0.4, 0.8, 0.9, np.nan, 5.0, 7.0, 7.5]
+    indicators = ["inflation_monthly_euro"] * 9 + ["unemployment_rate_monthly_euro"] * 3
+    df = pd.DataFrame({"indicator": indicators + ["unknown"], "value": values + [1.0]})
+
+    scored = load_thresholds(df, thresholds_df)
+
+    expected = [
+        _reference_score(v, i, thresholds_df)
+        for v, i in zip(df["value"], df["indicator"])
+    ]
+    expected = pd.Series(expected, dtype=float)
+    pd.testing.assert_series_equal(scored["score"], expected, check_names=False)
+
+
+def test_load_threshold_rules_compiles_and_caches(tmp_path, monkeypatch):
+    threshold_file = tmp_path / "thresholds.csv"
+    threshold_file.write_text(
+        THRESHOLDS_CSV + "gdp_growth,> 2%,0% – 1%,< 0%\n", encoding="utf-8"
+    )
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(transform_economic_data, "_THRESHOLD_RULES_CACHE", {})
+
+    rules = load_threshold_rules(str(threshold_file), cache_dir=str(cache_dir))
+
+    assert set(rules.indicators) == {
+        "inflation_monthly_euro",
+        "unemployment_rate_monthly_euro",
+        "gdp_growth",
+    }
+    assert ("gdp_growth", "(1, 2)") in rules.gaps
+    assert load_threshold_rules(str(threshold_file), cache_dir=str(cache_dir)) is rules
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # A fresh process reads the pickled rule set instead of re-parsing
+    monkeypatch.setattr(transform_economic_data, "_THRESHOLD_RULES_CACHE", {})
+    monkeypatch.setattr(
+        transform_economic_data,
+        "threshold_csv_to_df",
+        lambda file: pytest.fail("threshold CSV parsed despite disk cache"),
+    )
+    cached = load_threshold_rules(str(threshold_file), cache_dir=str(cache_dir))
+
+    df = pd.DataFrame({"indicator": ["gdp_growth"] * 3, "value": [3.0, 0.5, 1.5]})
+    np.testing.assert_array_equal(
+        load_thresholds(df, cached)["score"], [2.0, 1.0, np.nan]
+    )
+
+
+def test_load_threshold_rules_replaces_stale_pickles(tmp_path, monkeypatch):
+    threshold_file = tmp_path / "thresholds.csv"
+    threshold_file.write_text(THRESHOLDS_CSV, encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(transform_economic_data, "_THRESHOLD_RULES_CACHE", {})
+    load_threshold_rules(str(threshold_file), cache_dir=str(cache_dir))
+    first = list(cache_dir.iterdir())
+
+    threshold_file.write_text(
+        THRESHOLDS_CSV + "gdp_growth,> 2%,0% – 1%,< 0%\n", encoding="utf-8"
+    )
+    os.utime(threshold_file, ns=(1, 1))
+    rules = load_threshold_rules(str(threshold_file), cache_dir=str(cache_dir))
+
+    assert "gdp_growth" in rules.indicators
+    remaining = list(cache_dir.iterdir())
+    assert len(remaining) == 1 and remaining != first
+
+
+def test_load_threshold_rules_recompiles_unreadable_or_old_pickles(
+    tmp_path, monkeypatch
+):
+    threshold_file = tmp_path / "thresholds.csv"
+    threshold_file.write_text(THRESHOLDS_CSV, encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(transform_economic_data, "_THRESHOLD_RULES_CACHE", {})
+    load_threshold_rules(str(threshold_file), cache_dir=str(cache_dir))
+    (cache_file,) = cache_dir.iterdir()
+
+    # a truncated pickle is a miss and gets rewritten
+    cache_file.write_bytes(b"\x80\x05truncated")
+    monkeypatch.setattr(transform_economic_data, "_THRESHOLD_RULES_CACHE", {})
+    rules = load_threshold_rules(str(threshold_file), cache_dir=str(cache_dir))
+    assert "inflation_monthly_euro" in rules.indicators
+    assert list(cache_dir.iterdir()) == [cache_file]
+
+    # a new rule set version does not read the old pickle
+    monkeypatch.setattr(transform_economic_data, "RULE_SET_VERSION", "test")
+    monkeypatch.setattr(transform_economic_data, "_THRESHOLD_RULES_CACHE", {})
+    load_threshold_rules(str(threshold_file), cache_dir=str(cache_dir))
+    assert list(cache_dir.iterdir()) != [cache_file]
+
+
+def _long_frame(indicator, dates, values):
+    return pd.DataFrame(
+        {"indicator": indicator, "date": pd.to_datetime(dates), "value": values}
+    )
+
+
+def test_align_frequency_aggregates_all_series_in_one_pass():
+    df = pd.concat(
+        [
+            _long_frame(
+                "US Federal Funds Rate",
+                ["2024-01-02", "2024-01-31", "2024-02-15", "2024-04-01"],
+                [5.0, 5.5, 4.0, 3.0],
+            ),
+            _long_frame("GDP", ["2023-10-01", "2024-01-01"], [1.0, 2.0]),
+        ]
+    )
+
+    mean = align_frequency(df, "MS", "mean", end="2024-04-30")
+    last = align_frequency(df, "MS", "last", end="2024-04-30")
+    asof = align_frequency(df, "MS", "asof", start="2024-01-01", end="2024-04-01")
+
+    fed = mean[mean["indicator"] == "US Federal Funds Rate"]
+    assert fed["date"].dt.strftime("%Y-%m").tolist() == [
+        "2024-01",
+        "2024-02",
+        "2024-04",
+    ]
+    assert fed["value"].tolist() == [5.25, 4.0, 3.0]
+    assert last[last["indicator"] == "US Federal Funds Rate"]["value"].tolist() == [
+        5.5,
+        4.0,
+        3.0,
+    ]
+    assert asof[asof["indicator"] == "GDP"]["value"].tolist() == [2.0, 2.0, 2.0, 2.0]
+    assert asof[asof["indicator"] == "US Federal Funds Rate"]["value"].tolist() == [
+        5.5,
+        4.0,
+        3.0,
+    ]
+
+
+def test_set_monthly_ecb_interest_rate_steps_to_explicit_end_date():
+    df = _long_frame(
+        "Eurozone Interest Rate (Main Refinancing Operations)",
+        ["2023-09-20", "2024-06-12"],
+        [4.5, 4.25],
+    )
+
+    monthly = set_monthly_ecb_interest_rate(df, "2023-07-01", "2024-08-15")
+
+    assert monthly["date"].iloc[0] == pd.Timestamp("2023-07-01")
+    assert monthly["date"].iloc[-1] == pd.Timestamp("2024-08-01")
+    assert len(monthly) == 14
+    assert monthly["value"].iloc[:12].tolist() == [4.5] * 12
+    assert monthly["value"].iloc[12:].tolist() == [4.25] * 2
+
+
+def test_compute_derived_series_matches_periods_by_date():
+    cpi = _long_frame(
+        "US CPI",
+        ["2023-01-01", "2023-02-01", "2023-04-01", "2024-01-01", "2024-02-01"],
+        [100.0, 101.0, 102.0, 110.0, 111.1],
+    ).assign(source="FRED", unit="Index")
+
+    derived = compute_derived_series(
+        cpi,
+        {
+            "US CPI": [
+                Derivation("mom", "US CPI MoM", "Percent"),
+                Derivation("yoy", "US CPI YoY", "Percent"),
+                Derivation("diff", "US CPI diff"),
+                Derivation("rebase", "US CPI 2023=100", base_date="2023-01-15"),
+            ]
+        },
+    )
+
+    by_name = {name: group for name, group in derived.groupby("indicator")}
+    mom = by_name["US CPI MoM"]
+    # 2023-04 has no March observation and 2024-01 no December one
+    assert mom["date"].dt.strftime("%Y-%m").tolist() == ["2023-02", "2024-02"]
+    assert np.allclose(mom["value"], [1.0, 1.0])
+    assert np.allclose(by_name["US CPI YoY"]["value"], [10.0, 10.0])
+    assert by_name["US CPI diff"]["unit"].unique().tolist() == ["Index"]
+    assert np.allclose(
+        by_name["US CPI 2023=100"]["value"], [100.0, 101.0, 102.0, 110.0, 111.1]
+    )
+    assert set(derived["source"]) == {"FRED"}
+
+
+def test_append_derived_series_appends_once():
+    cpi = _long_frame("US CPI", ["2024-01-01", "2024-02-01"], [100.0, 102.0])
+
+    df = append_derived_series(cpi, {"US CPI": [Derivation("mom", "US CPI MoM")]})
+
+    assert df["indicator"].tolist() == ["US CPI", "US CPI", "US CPI MoM"]
+    assert df["value"].iloc[-1] == pytest.approx(2.0)
+
+
+def test_panel_keeps_categorical_labels_through_derive_and_rename():
+    dfs = []
+    label_and_append(
+        _long_frame(None, ["2024-01-01", "2024-02-01"], [100.0, 101.0]).drop(
+            columns="indicator"
+        ),
+        "US CPI",
+        "FRED",
+        "Index",
+        dfs,
+    )
+    label_and_append(
+        _long_frame(None, ["2024-01-01"], [3.9]).drop(columns="indicator"),
+        "US Unemployment Rate",
+        "FRED",
+        "Percent",
+        dfs,
+    )
+
+    panel = concat_panel(dfs, value_dtype="float32")
+    panel = append_derived_series(
+        panel,
+        {"US CPI": [Derivation("mom", "US CPI (Monthly Rate of Change)", "Percent")]},
+    )
+    panel = rename_economic_indicators(panel)
+
+    assert all(
+        isinstance(panel[column].dtype, pd.CategoricalDtype)
+        for column in ("indicator", "source", "unit")
+    )
+    assert panel["value"].dtype == np.float32
+    assert panel["indicator"].tolist() == [
+        "inflation_index_monthly_us",
+        "inflation_index_monthly_us",
+        "unemployment_monthly_rate_us",
+        "inflation_monthly_us",
+    ]
+    assert panel["unit"].tolist()[-1] == "Percent"
+    assert panel.groupby("indicator", observed=True).size().to_dict() == {
+        "inflation_index_monthly_us": 2,
+        "unemployment_monthly_rate_us": 1,
+        "inflation_monthly_us": 1,
+    }
+
+
+def test_memoize_transform_reuses_output_until_payload_or_version_changes(
+    tmp_path, monkeypatch
+):
+    calls = []
+
+    def transform(payload, from_date=None):
+        calls.append(payload)
+        return fred_json_to_df(payload, from_date)
+
+    monkeypatch.setattr(
+        transform_cache, "_transform_cache", TransformCache(str(tmp_path))
+    )
+    payload = {"observations": [{"date": "2024-01-01", "value": "3.7"}]}
+
+    first = memoize_transform(transform, payload, "2020-01-01", version="1")
+    second = memoize_transform(transform, dict(payload), "2020-01-01", version="1")
+    memoize_transform(transform, payload, "2020-01-01", version="2")
+    memoize_transform(
+        transform,
+        {"observations": [{"date": "2024-02-01", "value": "3.9"}]},
+        "2020-01-01",
+        version="1",
+    )
+
+    assert len(calls) == 3
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_transform_cache_evicts_least_recently_used_and_tracks_loads(tmp_path):
+    cache = TransformCache(str(tmp_path))
+    df = pd.DataFrame({"value": np.arange(1000, dtype=float)})
+    cache.put("a", df)
+    cache.put("b", df)
+    os.utime(tmp_path / "a.parquet", (1, 1))
+    cache.max_bytes = os.path.getsize(tmp_path / "b.parquet")
+    cache.evict()
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+    key = payload_fingerprint({"b": 1, "a": [1, 2]})
+    assert key == payload_fingerprint({"a": [1, 2], "b": 1})
+    assert not cache.is_loaded("US CPI", key)
+    cache.mark_loaded("US CPI", key)
+    assert cache.is_loaded("US CPI", key)
+    assert not cache.is_loaded("US CPI", payload_fingerprint({"a": [1, 2]}))
+
+
+def test_rename_economic_indicators_merges_categories_with_existing_names():
+    dfs = []
+    for name in ("US CPI", "inflation_index_monthly_us", "Custom"):
+        label_and_append(
+            _long_frame(None, ["2024-01-01"], [1.0]).drop(columns="indicator"),
+            name,
+            "FRED",
+            "Index",
+            dfs,
+        )
+    panel = concat_panel(dfs)
+
+    panel = rename_economic_indicators(panel)
+
+    assert isinstance(panel["indicator"].dtype, pd.CategoricalDtype)
+    assert panel["indicator"].tolist() == [
+        "inflation_index_monthly_us",
+        "inflation_index_monthly_us",
+        "Custom",
+    ]
+
+
+def test_transform_cache_marks_loaded_atomically(tmp_path):
+    cache = TransformCache(str(tmp_path))
+    cache.mark_loaded("US CPI", "first")
+    cache.mark_loaded("US CPI", "second")
+
+    assert cache.is_loaded("US CPI", "second")
+    assert [p.name for p in (tmp_path / "loaded").iterdir() if p.suffix == ".tmp"] == []
@@ -0,0 +1,52 @@
+from datetime import date
+
+import pandas as pd
+
+from economic_data.transform.transform_stockmarket_data import (
+    convert_google_finance_data_to_dict,
+    google_finance_data_to_df,
+)
+
+SHEET_VALUES = [
+    ["Ticker_id", "Date", "Open", "High", "Low", "Close", "Volume"],
+    [
+        "INDEXNASDAQ:OMXSPI",
+        "2018-01-02 16.00.00",
+        "569,51",
+        "570,79",
+        "567,46",
+        "569,8",
+        "0",
+    ],
+    [
+        "INDEXNASDAQ:OMXSPI",
+        "2018-01-03 16.00.00",
+        "571,04",
+        "574,31",
+        "570,21",
+        "573,6",
+        "#N/A",
+    ],
+]
+
+
+def test_google_finance_data_to_df_is_typed():
+    df = google_finance_data_to_df(SHEET_VALUES)
+
+    assert df["date"].tolist() == list(pd.to_datetime(["2018-01-02", "2018-01-03"]))
+    assert df["close_value"].tolist() == [569.8, 573.6]
+    assert df["volume"].tolist() == [0, 0]
+    assert df["volume"].dtype == "int64"
+
+
+def test_convert_google_finance_data_to_dict_keeps_record_format():
+    records = convert_google_finance_data_to_dict(SHEET_VALUES)
+
+    assert records[0] == {
+        "date": date(2018, 1, 2),
+        "open_value": 569.51,
+        "high_value": 570.79,
+        "low_value": 567.46,
+        "close_value": 569.8,
+        "volume": 0,
+    }
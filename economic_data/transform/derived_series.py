@@ -0,0 +1,173 @@
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from economic_data.transform.panel import concat_panel
+
+logger = logging.getLogger(__name__)
+
+# operation -> default lag in periods
+DERIVED_OPERATIONS = {
+    "mom": 1,
+    "yoy": 12,
+    "diff": 1,
+    "log_return": 1,
+    "rebase": 0,
+}
+
+
+@dataclass(frozen=True)
+class Derivation:
+    """One series derived from an indicator.
+
+    Attributes:
+
+        operation (str): "mom" and "yoy" (percent change), "diff", "log_return"
+            or "rebase" (index with value 100 at `base_date`).
+        name (str): Indicator label of the derived series.
+        unit (str or None): Unit of the derived series, the parent unit if None.
+        periods (int or None): Lag in periods of `freq`, the operation default if None.
+        base_date (str or None): Date whose period is rebased to 100, the first
+            observation if None. Only used by "rebase".
+    """
+
+    operation: str
+    name: str
+    unit: str = None
+    periods: int = None
+    base_date: str = None
+
+    def __post_init__(self):
+        if self.operation not in DERIVED_OPERATIONS:
+            raise ValueError(f"Unknown derived series operation: {self.operation}")
+
+
+def _period_ordinals(dates, freq):
+    return pd.PeriodIndex(pd.to_datetime(dates), freq=freq).asi8
+
+
+def compute_derived_series(
+    df,
+    derivations,
+    freq="M",
+    by="indicator",
+    date_column="date",
+    value_column="value",
+):
+    """
+    Computes derived series for every indicator in `derivations` at once.
+
+    Observations are matched on their `freq` period rather than on row
+    position, so the value `periods` periods earlier is looked up by date and
+    a gap in a series gives a missing derived value instead of comparing
+    against the wrong observation. All derivations are resolved with the same
+    two merges, one for lagged values and one for rebase values.
+
+    Parameters:
+    ----------
+    df : pd.DataFrame
+        Long frame with `by`, `date_column` and `value_column`. Other columns
+        (e.g. 'source' and 'unit') are carried over to the derived rows.
+    derivations : dict
+        Indicator -> list of Derivation.
+    freq : str, optional
+        Period frequency used to match observations. Default is "M".
+
+    Returns:
+    -------
+    pd.DataFrame
+        Derived rows with the columns of `df`, `by` set to each derivation's
+        name. Rows without a derived value (the first periods, gaps) are dropped.
+    """
+    specs = pd.DataFrame(
+        [
+            {
+                by: indicator,
+                "_operation": d.operation,
+                "_name": d.name,
+                "_unit": d.unit,
+                "_lag": (
+                    d.periods
+                    if d.periods is not None
+                    else DERIVED_OPERATIONS[d.operation]
+                ),
+                "_base": d.base_date,
+            }
+            for indicator, indicator_derivations in derivations.items()
+            for d in indicator_derivations
+        ],
+        columns=[by, "_operation", "_name", "_unit", "_lag", "_base"],
+    )
+    if df is None or df.empty or specs.empty:
+        return pd.DataFrame(columns=[] if df is None else df.columns)
+
+    data = df[df[by].isin(specs[by])].copy()
+    data[by] = data[by].astype(object)
+    data[date_column] = pd.to_datetime(data[date_column])
+    data["_period"] = _period_ordinals(data[date_column], freq)
+    # one observation per period, the latest one wins
+    data = data.sort_values(date_column, kind="stable").drop_duplicates(
+        [by, "_period"], keep="last"
+    )
+    lookup = data[[by, "_period", value_column]]
+
+    derived = data.merge(specs, on=by)
+    derived["_lag_period"] = derived["_period"] - derived["_lag"]
+    first_period = data.groupby(by, observed=True)["_period"].min()
+    base = derived["_base"].dropna()
+    derived["_base_period"] = derived[by].map(first_period)
+    if not base.empty:
+        derived.loc[base.index, "_base_period"] = _period_ordinals(base, freq)
+
+    derived = derived.merge(
+        lookup.rename(columns={"_period": "_lag_period", value_column: "_previous"}),
+        on=[by, "_lag_period"],
+        how="left",
+    ).merge(
+        lookup.rename(columns={"_period": "_base_period", value_column: "_base_value"}),
+        on=[by, "_base_period"],
+        how="left",
+    )
+
+    current = derived[value_column].to_numpy(dtype=float)
+    previous = derived["_previous"].to_numpy(dtype=float)
+    operation = derived["_operation"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        derived[value_column] = np.select(
+            [
+                np.isin(operation, ["mom", "yoy"]),
+                operation == "diff",
+                operation == "log_return",
+            ],
+            [
+                (current / previous - 1) * 100,
+                current - previous,
+                np.log(current / previous),
+            ],
+            default=current / derived["_base_value"].to_numpy(dtype=float) * 100,
+        )
+
+    derived[by] = derived["_name"]
+    if "unit" in derived.columns:
+        derived["unit"] = derived["_unit"].fillna(derived["unit"])
+    derived = derived[np.isfinite(derived[value_column])]
+    logger.info(
+        f"Derived {len(specs)} series from {specs[by].nunique()} indicators: "
+        f"{len(derived)} records"
+    )
+    return derived[df.columns].reset_index(drop=True)
+
+
+def append_derived_series(df, derivations, **kwargs):
+    """
+    Returns `df` with the series of compute_derived_series appended in a single
+    concat (see concat_panel), keeping categorical label columns categorical.
+    See compute_derived_series for the arguments.
+    """
+    derived = compute_derived_series(df, derivations, **kwargs)
+    if derived.empty:
+        return df
+    value_column = kwargs.get("value_column", "value")
+    return concat_panel([df, derived], value_dtype=df[value_column].dtype)
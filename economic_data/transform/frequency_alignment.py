@@ -0,0 +1,127 @@
+import logging
+
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+logger = logging.getLogger(__name__)
+
+ALIGN_METHODS = ("asof", "step", "last", "mean")
+
+
+def _period_grid(dates, freq, start=None, end=None):
+    """
+    Returns the period start dates of `freq` from `start` to `end`, both
+    rolled back to the start of their period. Missing bounds default to the
+    first and last observation.
+    """
+    offset = to_offset(freq)
+    start = pd.to_datetime(start) if start is not None else dates.min()
+    end = pd.to_datetime(end) if end is not None else dates.max()
+    return pd.date_range(
+        offset.rollback(start.normalize()),
+        offset.rollback(end.normalize()),
+        freq=offset,
+    )
+
+
+def align_frequency(
+    df,
+    freq="MS",
+    method="asof",
+    start=None,
+    end=None,
+    by="indicator",
+    date_column="date",
+    value_column="value",
+):
+    """
+    Aligns every series of a long DataFrame to a common period grid in one
+    grouped pass.
+
+    The grid holds the start date of every `freq` period from `start` to `end`
+    (e.g. month starts for "MS", quarter starts for "QS", days for "D"), and
+    each series gets at most one value per period:
+
+    - "asof": the last observation on or before the period start.
+    - "step": like "asof", but the series is treated as a step function of
+      change points (e.g. policy rates), so periods before the first change
+      point are back-filled with the first aligned value.
+    - "last": the last observation inside the period (end-of-period value).
+    - "mean": the mean of the observations inside the period.
+
+    Parameters:
+    ----------
+    df : pd.DataFrame
+        Long frame with a date, a value and one or more series key columns.
+    freq : str, optional
+        Pandas frequency of the target grid, anchored at period starts.
+        Default is "MS".
+    method : str, optional
+        One of "asof", "step", "last" or "mean". Default is "asof".
+    start, end : datetime-like or str, optional
+        First and last period of the grid. Default is the first and last
+        observation of the frame.
+    by : str or list of str, optional
+        Columns identifying a series. Default is "indicator".
+    date_column, value_column : str, optional
+        Names of the date and value columns.
+
+    Returns:
+    -------
+    pd.DataFrame
+        The `by` columns, `date_column` (period start) and `value_column`,
+        sorted by series and date. Periods without a value are dropped.
+    """
+    if method not in ALIGN_METHODS:
+        raise ValueError(f"Unknown alignment method: {method}")
+    by = [by] if isinstance(by, str) else list(by)
+    columns = by + [date_column, value_column]
+    if df is None or df.empty:
+        return pd.DataFrame(columns=columns)
+
+    data = df[columns].copy()
+    data[date_column] = pd.to_datetime(data[date_column])
+    data = data.dropna(subset=[date_column, value_column])
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+    grid = _period_grid(data[date_column], freq, start, end)
+    if grid.empty:
+        return pd.DataFrame(columns=columns)
+
+    if method in ("asof", "step"):
+        series = data[by].drop_duplicates()
+        aligned = series.merge(
+            pd.DataFrame({date_column: grid}), how="cross"
+        ).sort_values(date_column, kind="stable")
+        data = data.sort_values(date_column, kind="stable")
+        aligned = pd.merge_asof(
+            aligned, data, on=date_column, by=by, direction="backward"
+        )
+        if method == "step":
+            aligned[value_column] = aligned.groupby(by, sort=False, observed=True)[
+                value_column
+            ].bfill()
+    else:
+        # Period i covers [grid[i], grid[i + 1]); observations outside the grid
+        # are dropped
+        edges = grid.append(pd.DatetimeIndex([grid[-1] + to_offset(freq)]))
+        position = edges.searchsorted(data[date_column], side="right") - 1
+        inside = (position >= 0) & (position < len(grid))
+        data = data[inside]
+        data = data.assign(
+            _period=grid[position[inside]], _order=data[date_column]
+        ).sort_values("_order", kind="stable")
+        data[date_column] = data.pop("_period")
+        aligned = (
+            data.groupby(by + [date_column], sort=False, observed=True)[value_column]
+            .agg("mean" if method == "mean" else "last")
+            .reset_index()
+        )
+
+    aligned = aligned.dropna(subset=[value_column])
+    aligned = aligned.sort_values(by + [date_column], kind="stable")
+    logger.info(
+        f"Aligned {aligned[by].drop_duplicates().shape[0]} series to {freq} "
+        f"with method {method}: {len(aligned)} records"
+    )
+    return aligned[columns].reset_index(drop=True)
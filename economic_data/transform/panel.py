@@ -0,0 +1,59 @@
+import logging
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+LABEL_COLUMNS = ("indicator", "source", "unit")
+
+
+def categorical_label(label, length):
+    """Returns a Categorical of `length` rows that all hold `label`, stored as codes."""
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), [label])
+
+
+def concat_panel(dfs, value_dtype=None, label_columns=LABEL_COLUMNS):
+    """
+    Concatenates long frames into one panel with categorical label columns.
+
+    The categories of every label column are unioned first and each frame is
+    recoded to them, so the single concat keeps the columns categorical
+    instead of falling back to object strings.
+
+    Args:
+        dfs (list of pd.DataFrame): Frames with 'date', 'value' and label columns.
+        value_dtype (str, optional): dtype of the 'value' column, e.g. "float32".
+            Kept as is if None.
+        label_columns (tuple): Columns stored as categoricals.
+
+    Returns:
+        pd.DataFrame: The concatenated panel with a fresh RangeIndex.
+    """
+    dfs = [df for df in dfs if df is not None and not df.empty]
+    if not dfs:
+        return pd.DataFrame(columns=["date", "value", *label_columns])
+
+    labels = {}
+    for column in label_columns:
+        present = [df[column] for df in dfs if column in df.columns]
+        if present:
+            labels[column] = union_categoricals(
+                [pd.Categorical(column_values) for column_values in present]
+            ).categories
+
+    recoded = []
+    for df in dfs:
+        columns = {
+            column: pd.Categorical(df[column], categories=categories)
+            for column, categories in labels.items()
+            if column in df.columns
+        }
+        if value_dtype is not None and "value" in df.columns:
+            columns["value"] = df["value"].astype(value_dtype)
+        recoded.append(df.assign(**columns))
+
+    panel = pd.concat(recoded, ignore_index=True, copy=False)
+    logger.debug(f"Concatenated {len(dfs)} frames into a panel of {len(panel)} rows")
+    return panel
@@ -0,0 +1,245 @@
+import logging
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# bump when ThresholdRuleSet or the rule compilation changes, so pickled rule
+# sets of earlier versions are recompiled
+RULE_SET_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class ThresholdRuleSet:
+    """Compiled, immutable threshold rules ready for vectorized scoring.
+
+    Attributes:
+
+        source (str): Where the rules came from, e.g. the threshold CSV path.
+        rules (pd.DataFrame): Normalized threshold rows (see threshold_csv_to_df).
+        index (Mapping): Read-only mapping of indicator to (breakpoints, segment_scores)
+            arrays, see compile_breakpoints.
+        gaps (tuple): (indicator, segment) pairs that no rule covers.
+        overlaps (tuple): (indicator, segment, labels) triples covered by rules with
+            different labels; the first rule in table order wins there.
+    """
+
+    source: str
+    rules: pd.DataFrame = field(repr=False)
+    index: Mapping = field(repr=False)
+    gaps: tuple = ()
+    overlaps: tuple = ()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["index"] = dict(self.index)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "index", MappingProxyType(dict(state["index"])))
+
+    @property
+    def indicators(self):
+        return tuple(self.index)
+
+
+def _segment_matches(rules):
+    """
+    Splits the number line at the finite range bounds of one indicator and
+    evaluates every rule on one representative value per elementary segment.
+
+    Returns:
+        tuple: (breakpoints, matches) where `matches[rule, segment]` is True if
+        the rule covers the segment. Segment 2k is the open interval ending at
+        breakpoints[k] and segment 2k + 1 is the point breakpoints[k].
+    """
+    min_val = rules["min_val"].to_numpy(dtype=float)
+    max_val = rules["max_val"].to_numpy(dtype=float)
+    inclusive_min = rules["inclusive_min"].to_numpy(dtype=bool)
+    inclusive_max = rules["inclusive_max"].to_numpy(dtype=bool)
+
+    bounds = np.concatenate([min_val, max_val])
+    breakpoints = np.unique(bounds[np.isfinite(bounds)])
+
+    # One representative value per segment: midpoints for open intervals,
+    # the breakpoint itself for point segments
+    if len(breakpoints):
+        edges = np.concatenate(
+            [[breakpoints[0] - 1.0], breakpoints, [breakpoints[-1] + 1.0]]
+        )
+    else:
+        edges = np.array([-1.0, 1.0])
+    representatives = np.empty(2 * len(breakpoints) + 1)
+    representatives[0::2] = (edges[:-1] + edges[1:]) / 2
+    representatives[1::2] = breakpoints
+
+    point = representatives[np.newaxis, :]
+    lower_ok = np.where(
+        inclusive_min[:, np.newaxis],
+        point >= min_val[:, np.newaxis],
+        point > min_val[:, np.newaxis],
+    )
+    upper_ok = np.where(
+        inclusive_max[:, np.newaxis],
+        point <= max_val[:, np.newaxis],
+        point < max_val[:, np.newaxis],
+    )
+    return breakpoints, lower_ok & upper_ok
+
+
+def _describe_segment(breakpoints, segment):
+    """Formats an elementary segment as an interval string, e.g. '(0.2, 0.4)' or '[0.2]'."""
+    k = segment // 2
+    if segment % 2:
+        return f"[{breakpoints[k]:g}]"
+    low = breakpoints[k - 1] if k > 0 else -np.inf
+    high = breakpoints[k] if k < len(breakpoints) else np.inf
+    return f"({low:g}, {high:g})"
+
+
+def compile_breakpoints(rules):
+    """
+    Compiles the ordered threshold ranges of one indicator into breakpoint arrays.
+
+    The finite range bounds split the number line into elementary segments:
+    the open interval before each breakpoint, the breakpoint itself, and the
+    open interval after the last one. Every range bound falls on a breakpoint,
+    so each rule either covers a whole segment or none of it. The first
+    matching rule (in row order) is resolved once per segment, which keeps
+    the first-match semantics of the row-wise scorer.
+
+    Args:
+        rules (pd.DataFrame): Threshold rows for one indicator with 'min_val',
+            'max_val', 'inclusive_min', 'inclusive_max' and 'score'.
+
+    Returns:
+        tuple: (breakpoints, segment_scores). `breakpoints` is a sorted float
+        array of length m, `segment_scores` a float array of length 2m + 1
+        where segment 2k is the open interval ending at breakpoints[k] and
+        segment 2k + 1 is the point breakpoints[k]. NaN marks segments that no
+        rule covers.
+    """
+    breakpoints, matches = _segment_matches(rules)
+    return breakpoints, _first_match_scores(matches, rules["score"])
+
+
+def _first_match_scores(matches, scores):
+    """Returns the score of the first matching rule per segment, NaN if none match."""
+    scores = np.asarray(scores, dtype=float)
+    segment_scores = np.full(matches.shape[1], np.nan)
+    if len(scores):
+        first_match = matches.argmax(axis=0)
+        matched = matches.any(axis=0)
+        segment_scores[matched] = scores[first_match[matched]]
+    return segment_scores
+
+
+def compile_threshold_rules(thresholds_df, source=None):
+    """
+    Compiles a normalized thresholds DataFrame into an immutable ThresholdRuleSet.
+
+    Gaps (values no range covers) and overlaps (values covered by ranges with
+    different labels) are detected per indicator at compile time and logged.
+    Overlaps at a shared boundary like "0.0% – 0.2%" / "0.2% – 0.4%" are
+    expected and only logged at debug level.
+
+    Args:
+        thresholds_df (pd.DataFrame): Output of threshold_csv_to_df.
+        source (str, optional): Description of where the rules came from.
+
+    Returns:
+        ThresholdRuleSet
+    """
+    index, gaps, overlaps = {}, [], []
+    for indicator, rules in thresholds_df.groupby("indicator", sort=False):
+        breakpoints, matches = _segment_matches(rules)
+        segment_scores = _first_match_scores(matches, rules["score"])
+        breakpoints.setflags(write=False)
+        segment_scores.setflags(write=False)
+        index[indicator] = (breakpoints, segment_scores)
+
+        labels = rules["label"].to_numpy()
+        for segment in np.flatnonzero(~matches.any(axis=0)):
+            gaps.append((indicator, _describe_segment(breakpoints, segment)))
+        for segment in np.flatnonzero(matches.sum(axis=0) > 1):
+            segment_labels = tuple(dict.fromkeys(labels[matches[:, segment]]))
+            if len(segment_labels) > 1:
+                overlaps.append(
+                    (indicator, _describe_segment(breakpoints, segment), segment_labels)
+                )
+
+    for indicator, segment in gaps:
+        logger.warning(f"Thresholds for {indicator} do not cover {segment}")
+    for indicator, segment, segment_labels in overlaps:
+        log = logger.debug if segment.startswith("[") else logger.warning
+        log(f"Thresholds for {indicator} overlap on {segment}: {segment_labels}")
+
+    return ThresholdRuleSet(
+        source=source,
+        rules=thresholds_df,
+        index=MappingProxyType(index),
+        gaps=tuple(gaps),
+        overlaps=tuple(overlaps),
+    )
+
+
+def score_values(values, breakpoints, segment_scores):
+    """
+    Scores an array of values against one indicator's compiled breakpoints
+    with a single np.searchsorted call.
+
+    Returns:
+        np.ndarray: Float scores, NaN where no range matches or the value is
+        missing or infinite.
+    """
+    values = np.asarray(values, dtype=float)
+    position = np.searchsorted(breakpoints, values, side="left")
+    on_breakpoint = np.zeros(len(values), dtype=bool)
+    inside = position < len(breakpoints)
+    on_breakpoint[inside] = breakpoints[position[inside]] == values[inside]
+    scores = segment_scores[2 * position + on_breakpoint]
+    scores[~np.isfinite(values)] = np.nan
+    return scores
+
+
+def score_frame(
+    df, threshold_index, value_column="value", indicator_column="indicator"
+):
+    """
+    Scores every row of a long DataFrame, one vectorized pass per indicator.
+
+    Args:
+        df (pd.DataFrame): Long frame with an indicator and a value column.
+        threshold_index (Mapping): Indicator to (breakpoints, segment_scores),
+            e.g. ThresholdRuleSet.index.
+
+    Returns:
+        np.ndarray: Float scores aligned with the rows of `df`, NaN where the
+        indicator has no thresholds or no range matches.
+    """
+    scores = np.full(len(df), np.nan)
+    if df.empty:
+        return scores
+
+    codes, indicators = pd.factorize(df[indicator_column], sort=False)
+    values = df[value_column].to_numpy(dtype=float)
+    order = np.argsort(codes, kind="stable")
+    starts = np.searchsorted(codes[order], np.arange(len(indicators) + 1))
+
+    for code, indicator in enumerate(indicators):
+        compiled = threshold_index.get(indicator)
+        if compiled is None:
+            continue
+        rows = order[starts[code] : starts[code + 1]]
+        scores[rows] = score_values(values[rows], *compiled)
+
+    unscored = sorted(set(indicators) - set(threshold_index))
+    if unscored:
+        logger.debug(f"No thresholds defined for indicators: {unscored}")
+    return scores
@@ -0,0 +1,199 @@
+# economic_data/transform/transform_cache.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSFORM_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "cache",
+    "transforms",
+)
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+COMPRESSION = "zstd"
+
+
+def payload_fingerprint(payload, *salt):
+    """
+    Returns the SHA-256 hex digest of a raw payload in canonical JSON form
+    (sorted keys, no whitespace), followed by the `salt` values, e.g. the
+    transform name and version.
+
+    Parameters:
+    ----------
+    payload : dict or list
+        Raw JSON payload or sheet rows.
+    *salt : str
+        Extra values that distinguish otherwise equal payloads.
+
+    Returns:
+    -------
+    str
+        The fingerprint.
+    """
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()
+    )
+    for value in salt:
+        digest.update(b"\0" + str(value).encode())
+    return digest.hexdigest()
+
+
+class TransformCache:
+    """Transform outputs stored as Parquet files keyed by payload fingerprint.
+
+    A file's mtime is refreshed whenever it is read, and the least recently
+    used files are removed once the cache holds more than `max_bytes`. The
+    cache also keeps "loaded" markers recording the fingerprint of the
+    payload last saved to the database per series, so unchanged payloads can
+    skip the load step. Markers live outside the database, so callers should
+    also check that the series still has stored rows before skipping.
+
+    Attributes:
+
+        path (str): Cache directory.
+        max_bytes (int or None): Maximum total size of cached outputs, None to disable.
+    """
+
+    def __init__(self, path=DEFAULT_TRANSFORM_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(path, "loaded"), exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.parquet")
+
+    def _marker(self, name):
+        return os.path.join(
+            self.path, "loaded", hashlib.sha256(name.encode()).hexdigest()
+        )
+
+    def get(self, key):
+        """Returns the cached DataFrame for `key`, or None on a miss."""
+        path = self._file(key)
+        try:
+            df = pd.read_parquet(path)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return df
+
+    def put(self, key, df):
+        """Stores a DataFrame under `key`, then enforces the size limit."""
+        path = self._file(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        df.to_parquet(tmp_path, engine="pyarrow", compression=COMPRESSION)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Drops the least recently used outputs above `max_bytes`."""
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.path):
+                if entry.is_file() and entry.name.endswith(".parquet"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+                evicted += 1
+            if evicted:
+                logger.info(
+                    f"Evicted {evicted} cached transform outputs to stay under size limit"
+                )
+
+    def is_loaded(self, name, key):
+        """Returns True if the payload with fingerprint `key` was already loaded for `name`."""
+        try:
+            with open(self._marker(name)) as f:
+                return f.read() == key
+        except FileNotFoundError:
+            return False
+
+    def mark_loaded(self, name, key):
+        """Records `key` as the fingerprint of the payload last loaded for `name`."""
+        path = self._marker(name)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(key)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """Removes all cached outputs and loaded markers."""
+        with self._lock:
+            for folder in (self.path, os.path.join(self.path, "loaded")):
+                for entry in os.scandir(folder):
+                    if entry.is_file():
+                        os.remove(entry.path)
+
+
+_transform_cache = None
+
+
+def get_transform_cache():
+    """Returns the process-wide TransformCache, or None if memoization is disabled."""
+    return _transform_cache
+
+
+def set_transform_cache(cache):
+    """Sets the process-wide TransformCache used by memoize_transform. Pass None to disable."""
+    global _transform_cache
+    _transform_cache = cache
+    return cache
+
+
+def memoize_transform(func, payload, *args, version=None, **kwargs):
+    """
+    Runs `func(payload, *args, **kwargs)` through the process-wide TransformCache.
+
+    The output is keyed by the payload fingerprint, the function's qualified
+    name, `version` and the remaining arguments, so bumping a transform's
+    version invalidates its cached outputs. Only DataFrame outputs are
+    cached; without a cache `func` is simply called.
+
+    Parameters:
+    ----------
+    func : callable
+        A pure transform of the raw payload returning a DataFrame.
+    payload : dict or list
+        The raw payload passed as first argument to `func`.
+    version : str, optional
+        Version of the transform, e.g. the module's TRANSFORM_VERSION.
+
+    Returns:
+    -------
+    pd.DataFrame or the return value of `func`
+    """
+    cache = get_transform_cache()
+    if cache is None or payload is None:
+        return func(payload, *args, **kwargs)
+
+    key = payload_fingerprint(
+        payload,
+        f"{func.__module__}.{func.__qualname__}",
+        version,
+        args,
+        sorted(kwargs.items()),
+    )
+    df = cache.get(key)
+    if df is not None:
+        logger.info(f"Reused cached output of {func.__name__} ({key[:12]})")
+        return df
+    df = func(payload, *args, **kwargs)
+    if isinstance(df, pd.DataFrame):
+        cache.put(key, df)
+    return df
@@ -2,37 +2,180 @@ import pandas as pd
 import logging
 import numpy as np
 import re
+import os
+import io
+import hashlib
+import pickle
+
+from economic_data.transform.derived_series import Derivation, compute_derived_series
+from economic_data.transform.frequency_alignment import align_frequency
+from economic_data.transform.panel import categorical_label, concat_panel
+from economic_data.transform.threshold_scoring import (
+    RULE_SET_VERSION,
+    ThresholdRuleSet,
+    compile_threshold_rules,
+    score_frame,
+)
 
 logger = logging.getLogger(__name__)
 
+# bump when the output of a transform in this module changes, so outputs
+# memoized by memoize_transform are recomputed
+TRANSFORM_VERSION = "1"
 
-def eurostat_json_to_df(data_json, data_code):
+
+def _parse_time_periods(periods):
     """
-    Transforms Eurostat JSON to DataFrame.
+    Parses an array of Eurostat/SDMX time period ids into timestamps with one
+    vectorized call. The format is picked from the first id:
+    'YYYY-MM-DD', 'YYYY-MM', 'YYYYMmm', 'YYYY-Qn' / 'YYYYQn' or 'YYYY'.
+    Returns a DatetimeIndex with the start of each period.
+    """
+    periods = pd.Index(periods, dtype=object)
+    if len(periods) == 0:
+        return pd.DatetimeIndex([])
+    first = str(periods[0])
+    if "Q" in first:
+        return pd.PeriodIndex(
+            periods.str.replace("-", "", regex=False), freq="Q"
+        ).to_timestamp()
+    if len(first) == 10:
+        return pd.to_datetime(periods, format="%Y-%m-%d")
+    if len(first) == 7 and first[4] == "M":
+        return pd.to_datetime(periods, format="%YM%m")
+    if len(first) == 7:
+        return pd.to_datetime(periods, format="%Y-%m")
+    if len(first) == 4:
+        return pd.to_datetime(periods, format="%Y")
+    return pd.to_datetime(periods)
+
+
+def _eurostat_values_to_arrays(data_json):
+    """
+    Converts the sparse JSON-stat `value` object (flat index -> value) into
+    sorted NumPy arrays of flat indexes and float values, skipping missing cells.
+    """
+    values = data_json.get("value", {})
+    if isinstance(values, list):
+        flat_index = np.arange(len(values), dtype=np.int64)
+        value_array = np.array(values, dtype=float)
+    else:
+        flat_index = np.fromiter(
+            map(int, values.keys()), dtype=np.int64, count=len(values)
+        )
+        value_array = np.array(list(values.values()), dtype=float)
+    order = np.argsort(flat_index, kind="stable")
+    flat_index, value_array = flat_index[order], value_array[order]
+    present = ~np.isnan(value_array)
+    return flat_index[present], value_array[present]
+
+
+def _category_ids(dimension):
+    """Returns the category ids of a JSON-stat dimension ordered by position."""
+    index = dimension["category"]["index"]
+    if isinstance(index, list):
+        return np.array(index, dtype=object)
+    ids = np.empty(len(index), dtype=object)
+    ids[np.fromiter(index.values(), dtype=np.int64, count=len(index))] = list(
+        index.keys()
+    )
+    return ids
+
+
+def eurostat_json_to_long_df(data_json, data_code):
+    """
+    Decodes a full multi-dimensional Eurostat JSON-stat cube into a long DataFrame.
+
+    Every non-missing cell becomes one row with one categorical column per
+    dimension (e.g. 'geo', 'indic', 's_adj', 'unit'), a parsed 'date' column
+    for the time dimension and a 'value' column. The flat cell index is split
+    into per-dimension positions with vectorized row-major stride arithmetic,
+    so decoding is linear in the number of non-missing cells.
+
+    Parameters:
+    - data_json: JSON data from the Eurostat API.
+    - data_code: Eurostat dataset code, used for logging.
+    Returns:
+    - DataFrame with one column per dimension plus 'date' and 'value', or None on error.
     """
     try:
-        time_mapping = data_json["dimension"]["time"]["category"]["index"]
-        time_list = sorted(time_mapping.keys(), key=lambda x: time_mapping[x])
-        available_indexes = set(map(int, data_json.get("value", {}).keys()))
-        months, values = [], []
-        for i, time in enumerate(time_list):
-            if i in available_indexes:
-                months.append(time)
-                values.append(data_json["value"][str(i)])
+        flat_index, values = _eurostat_values_to_arrays(data_json)
+        dimension_ids = data_json["id"]
+        sizes = np.asarray(data_json["size"], dtype=np.int64)
+        strides = np.append(np.cumprod(sizes[::-1])[::-1][1:], 1)
+
+        columns = {}
+        for dimension_id, size, stride in zip(dimension_ids, sizes, strides):
+            position = (flat_index // stride) % size
+            ids = _category_ids(data_json["dimension"][dimension_id])
+            if dimension_id == "time":
+                columns["date"] = _parse_time_periods(ids[position])
             else:
-                months.append(time)
-                values.append(None)
-        df = pd.DataFrame({"date": months, "value": values})
-        df = df.dropna()
-        if not df.empty:
-            df["date"] = pd.to_datetime(df["date"])
-        logger.info(f"Transformed Eurostat data for {data_code}: {len(df)} records")
+                columns[dimension_id] = pd.Categorical.from_codes(
+                    position, categories=ids
+                )
+        columns["value"] = values
+
+        df = pd.DataFrame(columns)
+        logger.info(
+            f"Decoded Eurostat cube for {data_code}: {len(df)} records over "
+            f"dimensions {dimension_ids}"
+        )
         return df
     except Exception as e:
-        logger.error(f"Error processing Eurostat data for {data_code}: {e}")
+        logger.error(f"Error decoding Eurostat cube for {data_code}: {e}")
         return None
 
 
+def eurostat_json_to_df(
+    data_json, data_code, selection=None, allow_multiple_series=False
+):
+    """
+    Transforms Eurostat JSON to DataFrame.
+    Dimensions with a single category are dropped, so a single-series cube gives
+    'date' and 'value' only. A cube holding several series (e.g. several
+    coicop, geo or indic/s_adj/unit categories) is reduced to one series with
+    `selection`; otherwise a ValueError is raised, unless
+    `allow_multiple_series` is True, in which case the varying dimensions are
+    kept as columns so the series are not mixed together.
+
+    Parameters:
+    - data_json: JSON data from the Eurostat API.
+    - data_code: Eurostat dataset code, used for logging.
+    - selection: optional dict of dimension -> category id, e.g. {"coicop": "CP00"}.
+    - allow_multiple_series: keep several series with their dimension columns.
+    Returns:
+    - DataFrame with 'date' and 'value' (plus varying dimensions), or None on a
+      malformed payload.
+    """
+    df = eurostat_json_to_long_df(data_json, data_code)
+    if df is None:
+        return None
+    selection = selection or {}
+    unknown = set(selection) - set(data_json["id"])
+    if unknown:
+        raise ValueError(f"Unknown dimensions {sorted(unknown)} for {data_code}")
+    for dimension_id, category in selection.items():
+        df = df[df[dimension_id] == category]
+    varying = [
+        dimension_id
+        for dimension_id, size in zip(data_json["id"], data_json["size"])
+        if dimension_id != "time" and dimension_id not in selection and size > 1
+    ]
+    if varying and not allow_multiple_series:
+        raise ValueError(
+            f"Eurostat data for {data_code} holds several series over dimensions "
+            f"{varying}; pass a selection for them"
+        )
+    df = df[["date", "value"] + varying].reset_index(drop=True)
+    if varying:
+        logger.warning(
+            f"Eurostat data for {data_code} holds several series, keeping dimensions {varying}"
+        )
+    logger.info(f"Transformed Eurostat data for {data_code}: {len(df)} records")
+    return df
+
+
 # INDEX skapas nedan
 
 
@@ -100,14 +243,17 @@ def convert_eurostat_infl_ind_to_dict(data_json, name, description):
 #             values.append(None)
 
 
-def convert_eurostat_infl_data_to_dict(data_json, data_code):
+def convert_eurostat_infl_data_to_dict(data_json, data_code, selection=None):
     """
+    Converts one Eurostat series to data point dicts, see eurostat_json_to_df
+    for `selection`.
+
     id = Column(Integer, primary_key=True)
     indicator_id = Column(Integer, ForeignKey("economic_indicators.id"), nullable=False)
     date = Column(Date, nullable=False)
     value = Column(Float, nullable=False)
     """
-    data = eurostat_json_to_df(data_json, data_code)
+    data = eurostat_json_to_df(data_json, data_code, selection)
 
     # convert the dataframe to a list of dictionaries
     data_list = data.to_dict(orient="records")
@@ -119,62 +265,133 @@ def convert_eurostat_infl_data_to_dict(data_json, data_code):
 # SLUT --------------------
 
 
-def ecb_json_to_df(data_json, dataflow_ref, series_key):
+def ecb_json_to_long_df(data_json, dataflow_ref, series_key):
     """
-    Transforms ECB JSON to DataFrame.
+    Decodes every series in an ECB SDMX-JSON response into a long DataFrame.
+
+    Series keys such as "0:0:0:0:0:1:0" are decoded against
+    `structure.dimensions.series` into one categorical column per series
+    dimension (e.g. 'FREQ', 'PROVIDER_FM_ID'), and observation time positions
+    are mapped through the parsed `TIME_PERIOD` values with array indexing.
+    This makes wildcard keys like "B.U2.EUR.4F.KR.MRR_FR+DFR+MLFR.LEV" usable
+    in a single request.
+
+    Parameters:
+    - data_json: JSON data from the ECB Data Portal API.
+    - dataflow_ref: Dataflow, e.g. "FM", used for logging.
+    - series_key: Series key that was requested, used for logging.
+    Returns:
+    - DataFrame with one column per series dimension plus 'date' and 'value',
+      or None on error.
     """
     try:
-        monthly_data = []
-        time_periods_list = data_json["structure"]["dimensions"]["observation"][0][
-            "values"
-        ]
-        series_data = next(iter(data_json["dataSets"][0]["series"].values()))
-        observations = series_data["observations"]
-        for period_index_str, value_list in observations.items():
-            period_index = int(period_index_str)
-            time_period_obj = time_periods_list[period_index]
-            time_period = time_period_obj["id"]
-            indicator_value = (
-                value_list[0] if value_list and value_list[0] is not None else None
+        structure = data_json["structure"]["dimensions"]
+        series_dimensions = structure["series"]
+        time_ids = [value["id"] for value in structure["observation"][0]["values"]]
+        time_values = _parse_time_periods(time_ids)
+
+        series_items = data_json["dataSets"][0]["series"]
+        key_codes, positions, values, lengths = [], [], [], []
+        for key, series in series_items.items():
+            observations = series.get("observations", {})
+            key_codes.append([int(code) for code in key.split(":")])
+            positions.append(
+                np.fromiter(
+                    map(int, observations.keys()),
+                    dtype=np.int64,
+                    count=len(observations),
+                )
             )
-            if indicator_value is not None:
-                monthly_data.append({"date": time_period, "value": indicator_value})
-        df = pd.DataFrame(monthly_data)
-        if not df.empty:
-            df["date"] = pd.to_datetime(df["date"])
+            values.append(
+                np.array(
+                    [obs[0] if obs else None for obs in observations.values()],
+                    dtype=float,
+                )
+            )
+            lengths.append(len(observations))
+
+        key_codes = np.array(key_codes, dtype=np.int64).reshape(
+            len(series_items), len(series_dimensions)
+        )
+        lengths = np.array(lengths, dtype=np.int64)
+        position_array = np.concatenate(positions) if positions else np.array([], int)
+        value_array = np.concatenate(values) if values else np.array([], float)
+
+        columns = {}
+        for axis, dimension in enumerate(series_dimensions):
+            categories = [value["id"] for value in dimension["values"]]
+            columns[dimension["id"]] = pd.Categorical.from_codes(
+                np.repeat(key_codes[:, axis], lengths), categories=categories
+            )
+        columns["date"] = time_values[position_array]
+        columns["value"] = value_array
+
+        df = pd.DataFrame(columns)
+        df = df[df["value"].notna()]
+        df = df.sort_values([d["id"] for d in series_dimensions] + ["date"])
+        df = df.reset_index(drop=True)
         logger.info(
-            f"Transformed ECB data for {dataflow_ref} - {series_key}: {len(df)} records"
+            f"Decoded ECB data for {dataflow_ref} - {series_key}: "
+            f"{len(series_items)} series, {len(df)} records"
         )
         return df
     except Exception as e:
-        logger.error(
-            f"Error processing ECB data for {dataflow_ref} - {series_key}: {e}"
-        )
+        logger.error(f"Error decoding ECB data for {dataflow_ref} - {series_key}: {e}")
         return None
 
 
-def fred_json_to_df(data_json, from_date):
+def ecb_json_to_df(data_json, dataflow_ref, series_key):
+    """
+    Transforms ECB JSON to DataFrame.
+    A single-series response gives 'date' and 'value' only. For wildcard
+    requests returning several series, the series dimensions that vary
+    (e.g. 'PROVIDER_FM_ID') are kept as columns.
+    """
+    df = ecb_json_to_long_df(data_json, dataflow_ref, series_key)
+    if df is None:
+        return None
+    varying = [
+        column
+        for column in df.columns
+        if column not in ("date", "value") and df[column].nunique() > 1
+    ]
+    df = df[["date", "value"] + varying]
+    logger.info(
+        f"Transformed ECB data for {dataflow_ref} - {series_key}: {len(df)} records"
+    )
+    return df
+
+
+def fred_json_to_df(data_json, from_date=None):
     """
     Transforms FRED JSON to DataFrame.
 
+    The date and value columns are built directly from the observations: dates
+    are parsed with an explicit format and the "." missing-value sentinel is
+    coerced to NaN by pd.to_numeric, then dropped.
+
     Parameters:
     - data_json: JSON data from FRED API.
     - from_date: datetime-like or string (e.g., "2015-01-01"). If provided,
-                 it sets the lower bound of the monthly time series.
+                 it sets the lower bound of the monthly time series. The range is
+                 normally already applied by fetch_fred_json via `observation_start`,
+                 so this only guards against payloads fetched without it.
     Returns:
     - DataFrame with 'date' and 'value' columns, filtered by `from_date`.
     If `from_date` is not provided, it returns all records.
     """
     try:
         observations = data_json["observations"]
-        monthly_data = []
-        for obs in observations:
-            if obs["value"] != ".":
-                monthly_data.append({"date": obs["date"], "value": float(obs["value"])})
-        df = pd.DataFrame(monthly_data)
-        if not df.empty:
-            df["date"] = pd.to_datetime(df["date"])
-            df = df[df["date"] >= from_date]
+        dates = pd.to_datetime([obs["date"] for obs in observations], format="%Y-%m-%d")
+        values = pd.to_numeric(
+            pd.Series([obs["value"] for obs in observations], dtype=object),
+            errors="coerce",
+        ).to_numpy(dtype=float)
+
+        keep = ~np.isnan(values)
+        if from_date:
+            keep &= dates >= pd.to_datetime(from_date)
+        df = pd.DataFrame({"date": dates[keep], "value": values[keep]})
         logger.info(f"Transformed FRED data: {len(df)} records")
         return df
     except Exception as e:
@@ -185,33 +402,35 @@ def fred_json_to_df(data_json, from_date):
 def label_and_append(df, indicator, source, unit, dfs_to_merge):
     """
     Labels the DataFrame with indicator, source, and unit, then appends to list if not empty.
+    The labels are stored as single-category categoricals, see concat_panel.
     """
     if df is not None and not df.empty:
-        df["indicator"] = indicator
-        df["source"] = source
-        df["unit"] = unit
+        df["indicator"] = categorical_label(indicator, len(df))
+        df["source"] = categorical_label(source, len(df))
+        df["unit"] = categorical_label(unit, len(df))
         dfs_to_merge.append(df)
 
 
 def calculate_monthly_change(df, indicator_name):
     """
     Calculates the month-over-month percentage change for the given indicator data.
+    Months are matched by date, so a missing month gives no change for the next one.
     """
-    df = df.copy()
-    if df.empty:
+    if df is None or df.empty:
         return df
-    df = df[df["indicator"] == indicator_name].copy()
-    df = df.sort_values(by="date")
-    df["Previous_Value"] = df["value"].shift(1)
-    df["value"] = ((df["value"] - df["Previous_Value"]) / df["Previous_Value"]) * 100
-    df = df.iloc[1:]
-    df["indicator"] = df["indicator"] + " (Monthly rate of change)"
-    df["unit"] = "Percent"
-    df = df.drop(columns=["Previous_Value"])
-    return df
+    return compute_derived_series(
+        df,
+        {
+            indicator_name: [
+                Derivation(
+                    "mom", f"{indicator_name} (Monthly rate of change)", "Percent"
+                )
+            ]
+        },
+    )
 
 
-def set_monthly_ecb_interest_rate(df, start_date=None):
+def set_monthly_ecb_interest_rate(df, start_date=None, end_date=None):
     """
     Converts ECB interest rate data to monthly frequency starting from `start_date`,
     filling in interest rates from the latest known rate prior to each month.
@@ -221,46 +440,18 @@ def set_monthly_ecb_interest_rate(df, start_date=None):
     - start_date: optional datetime-like or string (e.g., "2015-01-01"). If provided,
                   it sets the lower bound of the monthly time series and fills
                   earlier months with the first known interest rate.
+    - end_date: optional datetime-like or string, the last month of the series.
+                Defaults to the current month.
 
     Returns:
     - monthly: DataFrame with one row per month starting from `start_date`,
                and interest rate values forward- and back-filled as needed.
     """
     mask_ECB = df["indicator"] == "Eurozone Interest Rate (Main Refinancing Operations)"
-
-    df = df[mask_ECB].copy()
-
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date")
-
-    # Determine full date range
-    start = (
-        pd.to_datetime(start_date).replace(day=1)
-        if start_date
-        else df["date"].min().replace(day=1)
+    end = end_date if end_date is not None else pd.Timestamp.today()
+    return align_frequency(
+        df[mask_ECB], freq="MS", method="step", start=start_date, end=end
     )
-    end = pd.Timestamp.today().replace(day=1)
-
-    # Create regular first-of-month date range
-    monthly = pd.DataFrame({"month_start": pd.date_range(start, end, freq="MS")})
-
-    # Reset index to use merge_asof
-    df = df.reset_index(drop=True)
-
-    # Merge: find latest past interest rate for each month
-    monthly = pd.merge_asof(
-        monthly, df, left_on="month_start", right_on="date", direction="backward"
-    )
-
-    # Backfill months before first change using the earliest known rate
-    # monthly = monthly.fillna(method="bfill")
-    monthly = monthly.bfill()
-
-    # Final cleanup
-    monthly["date"] = monthly["month_start"]
-    monthly = monthly.drop(columns=["month_start", "date_y"], errors="ignore")
-
-    return monthly
 
 
 def rename_economic_indicators(df):
@@ -286,7 +477,22 @@ def rename_economic_indicators(df):
         "US CPI": "inflation_index_monthly_us",
         "Eurozone Interest Rate (Main Refinancing Operations)": "interest_rate_change_day_euro",
     }
-    df["indicator"] = df["indicator"].replace(renaming_map)
+    if isinstance(df["indicator"].dtype, pd.CategoricalDtype):
+        categories = df["indicator"].cat.categories
+        renamed = [renaming_map.get(name, name) for name in categories]
+        if len(set(renamed)) == len(renamed):
+            # only the category dictionary is renamed, not every row
+            df["indicator"] = df["indicator"].cat.rename_categories(renamed)
+        else:
+            # a target name is already a category, so the codes are merged
+            merged = pd.Index(renamed).unique()
+            codes = df["indicator"].cat.codes.to_numpy()
+            df["indicator"] = pd.Categorical.from_codes(
+                np.where(codes >= 0, merged.get_indexer(renamed)[codes], -1),
+                merged,
+            )
+    else:
+        df["indicator"] = df["indicator"].replace(renaming_map)
     return df
 
 
@@ -302,6 +508,15 @@ def threshold_csv_to_df(file):
     """
 
     thresholds_df = pd.read_csv(file)
+    return _normalize_threshold_table(thresholds_df)
+
+
+def _normalize_threshold_table(thresholds_df):
+    """
+    Normalizes a raw threshold table into one row per numeric range with
+    'indicator', 'label', 'min_val', 'max_val', 'inclusive_min', 'inclusive_max'
+    and 'score' columns.
+    """
 
     def parse_range_expression(indicator, label, expr):
         """
@@ -378,48 +593,104 @@ def threshold_csv_to_df(file):
     return thresholds_normalized_df
 
 
-def load_thresholds(df, thresholds_df):
+# Compiled rule sets keyed by (absolute path, mtime), filled by load_threshold_rules
+_THRESHOLD_RULES_CACHE = {}
 
-    # --- Assign score to each row in financial data ---
-    def assign_score(value, indicator, thresholds_df):
-        """
-        Finds the matching score for a given value and indicator.
+THRESHOLD_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "cache",
+    "thresholds",
+)
 
-        Args:
-            value (float): The numeric value to evaluate
-            indicator (str): Name of the indicator
-            thresholds_df (pd.DataFrame): Normalized threshold definitions
 
-        Returns:
-            int or None: Score (0 = bad, 1 = medium, 2 = good), or None if no match
-        """
-        relevant = thresholds_df[thresholds_df["indicator"] == indicator]
+def load_threshold_rules(file, cache_dir=THRESHOLD_CACHE_DIR):
+    """
+    Loads a threshold CSV as a compiled ThresholdRuleSet, cached in memory and on disk.
+
+    The in-memory cache is keyed by the file's absolute path and mtime, so
+    repeated calls in a notebook session return the same object without reading
+    the file. The on-disk cache is keyed by path, mtime and a SHA-256 hash of the
+    content, so a new pipeline run only reads and hashes the file and skips
+    parsing and compilation. The key also holds RULE_SET_VERSION, so pickles
+    written by an earlier layout are recompiled, and a pickle that cannot be
+    loaded is treated as a miss. Older pickles of the same file are removed
+    when a new one is written.
+
+    Args:
+        file (str): Path to the threshold CSV (see threshold_csv_to_df for the layout).
+        cache_dir (str, optional): Directory for pickled rule sets. Pass None to
+            disable the on-disk cache.
 
-        for _, row in relevant.iterrows():
-            lower_ok = (
-                value > row["min_val"]
-                if not row["inclusive_min"]
-                else value >= row["min_val"]
-            )
-            upper_ok = (
-                value < row["max_val"]
-                if not row["inclusive_max"]
-                else value <= row["max_val"]
-            )
-            if lower_ok and upper_ok:
-                return row["score"]
-        return (
-            None  # fallback if no match (shouldn't happen if thresholds are exhaustive)
-        )
+    Returns:
+        ThresholdRuleSet
+    """
+    path = os.path.abspath(file)
+    mtime_ns = os.stat(path).st_mtime_ns
+    memory_key = (path, mtime_ns)
+    if memory_key in _THRESHOLD_RULES_CACHE:
+        return _THRESHOLD_RULES_CACHE[memory_key]
+
+    with open(path, "rb") as f:
+        content = f.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+    path_key = hashlib.sha256(path.encode()).hexdigest()[:16]
+    cache_key = hashlib.sha256(
+        f"{RULE_SET_VERSION}:{path}:{mtime_ns}:{content_hash}".encode()
+    ).hexdigest()
+    cache_file = (
+        os.path.join(cache_dir, f"{path_key}-{cache_key}.pkl") if cache_dir else None
+    )
 
-    # --- Run logic using your in-memory dataframes ---
-    # thresholds_df and financial_df should already exist
-    # thresholds_normalized_df = normalize_threshold_table(thresholds_df)
+    rule_set = None
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                rule_set = pickle.load(f)
+            if not isinstance(rule_set, ThresholdRuleSet):
+                raise TypeError(f"expected ThresholdRuleSet, got {type(rule_set)}")
+            logger.info(f"Loaded compiled thresholds for {file} from cache")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable threshold cache {cache_file}: {e}")
+            rule_set = None
+
+    if rule_set is None:
+        thresholds_df = threshold_csv_to_df(io.BytesIO(content))
+        rule_set = compile_threshold_rules(thresholds_df, source=path)
+        if cache_file:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "wb") as f:
+                pickle.dump(rule_set, f)
+            os.replace(tmp_file, cache_file)
+            # drop pickles of earlier versions of the same file
+            for entry in os.scandir(cache_dir):
+                if entry.name.startswith(f"{path_key}-") and entry.path != cache_file:
+                    os.remove(entry.path)
+        logger.info(f"Compiled thresholds for {file}: {len(rule_set.index)} indicators")
+
+    _THRESHOLD_RULES_CACHE[memory_key] = rule_set
+    return rule_set
+
+
+def load_thresholds(df, thresholds):
+    """
+    Assigns a score to each row in the financial data based on its indicator's thresholds.
 
-    # Apply scores in place
-    df["score"] = df.apply(
-        lambda row: assign_score(row["value"], row["indicator"], thresholds_df),
-        axis=1,
-    )
+    Each indicator's ranges are compiled into sorted breakpoint arrays, and
+    whole value columns are scored per indicator with np.searchsorted. The first
+    matching range wins, as in the threshold table order.
+
+    Args:
+        df (pd.DataFrame): Long frame with 'indicator' and 'value' columns.
+        thresholds (ThresholdRuleSet or pd.DataFrame): Compiled rules from
+            load_threshold_rules, or normalized threshold definitions from
+            threshold_csv_to_df (compiled on the fly).
 
+    Returns:
+        pd.DataFrame: `df` with a 'score' column (0 = bad, 1 = medium, 2 = good),
+        NaN if no range matches.
+    """
+    if not isinstance(thresholds, ThresholdRuleSet):
+        thresholds = compile_threshold_rules(thresholds)
+    df["score"] = score_frame(df, thresholds.index)
     return df
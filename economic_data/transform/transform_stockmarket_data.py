@@ -1,8 +1,24 @@
-from datetime import datetime
 import logging
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# bump when the output of a transform in this module changes, so outputs
+# memoized by memoize_transform are recomputed
+TRANSFORM_VERSION = "1"
+
+GOOGLE_FINANCE_DATE_FORMAT = "%Y-%m-%d %H.%M.%S"
+GOOGLE_FINANCE_CSV_COLUMNS = {
+    "Ticker_id": "ticker_id",
+    "Date": "date",
+    "Open": "open_value",
+    "High": "high_value",
+    "Low": "low_value",
+    "Close": "close_value",
+    "Volume": "volume",
+}
+
 
 def convert_google_finance_index_to_dict(index_data, name, description, source):
     """
@@ -32,6 +48,75 @@ def convert_google_finance_index_to_dict(index_data, name, description, source):
     return index_dict
 
 
+GOOGLE_FINANCE_PRICE_COLUMNS = ["open_value", "high_value", "low_value", "close_value"]
+
+
+def _decimal_comma_to_float(values):
+    """Converts a column of decimal-comma strings (or numbers) to float64, bad values to NaN."""
+    if values.dtype == object:
+        values = values.astype(str).str.replace(",", ".", regex=False)
+    return pd.to_numeric(values, errors="coerce").astype("float64")
+
+
+def _parse_sheet_dates(values):
+    """
+    Parses the date column of the sheet output. Unformatted reads return
+    spreadsheet serial numbers (days since 1899-12-30), formatted reads return
+    'YYYY-MM-DD HH.MM.SS' strings; both are parsed with one vectorized call.
+    Blank cells become NaT.
+    """
+    serials = pd.to_numeric(values, errors="coerce")
+    if serials.notna().any():
+        dates = pd.to_datetime(serials, unit="D", origin="1899-12-30")
+    else:
+        dates = pd.to_datetime(
+            values.replace("", None), format=GOOGLE_FINANCE_DATE_FORMAT
+        )
+    return dates.dt.normalize()
+
+
+def _volume_to_int(values):
+    """Converts a volume column to int64, with values that are not numbers set to 0."""
+    return pd.to_numeric(values, errors="coerce").fillna(0).astype("int64")
+
+
+def google_finance_data_to_df(index_data):
+    """
+    Convert stock market data from Google Finance into a typed DataFrame in one
+    columnar step, without building per-row dicts.
+
+    Args:
+        index_data (list of lists): The stock market data from Google Finance in raw
+            format, a header row followed by rows of ticker, date, open, high, low,
+            close and volume.
+    Returns:
+        pd.DataFrame: Columns 'date' (datetime64), 'open_value', 'high_value',
+        'low_value', 'close_value' (float64) and 'volume' (int64), ready for
+        save_stock_data.
+    Dates are read from spreadsheet serial numbers (unformatted reads) or parsed with
+    the fixed 'YYYY-MM-DD HH.MM.SS' format, decimal-comma prices are converted
+    column-wise, volume values that are not numbers are set to 0 and rows without
+    a date are dropped.
+    """
+    columns = ["date"] + GOOGLE_FINANCE_PRICE_COLUMNS + ["volume"]
+    rows = index_data[1:]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+
+    # Trailing empty cells are trimmed by the Sheets API, so pad short rows
+    raw = pd.DataFrame(
+        [(list(row) + [None] * 7)[1:7] for row in rows], columns=columns, dtype=object
+    )
+    df = pd.DataFrame({"date": _parse_sheet_dates(raw["date"])})
+    for column in GOOGLE_FINANCE_PRICE_COLUMNS:
+        df[column] = _decimal_comma_to_float(raw[column])
+    df["volume"] = _volume_to_int(raw["volume"])
+    df = df[df["date"].notna()].reset_index(drop=True)
+
+    logger.info(f"Converted {len(df)} rows of stock market data to a DataFrame.")
+    return df
+
+
 def convert_google_finance_data_to_dict(index_data):
     """
     Convert stock market data from Google Finance into a list of dictionaries.
@@ -43,42 +128,43 @@ def convert_google_finance_data_to_dict(index_data):
         'high_value', 'low_value', 'close_value', and 'volume'.
     The 'date' is converted to a datetime.date object, and numeric values are converted to floats.
     The 'volume' is converted to an integer if possible, otherwise set to 0.
+    Prefer google_finance_data_to_df, which feeds save_stock_data without the dicts.
 
     """
-    raw_data = index_data[1:]
-    data = []
-    for row in raw_data:
-        data.append(
-            {
-                "date": row[1],
-                "open_value": row[2],
-                "high_value": row[3],
-                "low_value": row[4],
-                "close_value": row[5],
-                "volume": row[6],
-            }
-        )
-    # Convert date strings to datetime.date objects
-    for row in data:
-        # If your DB expects datetime, use datetime.strptime(...), else use .date()
-        row["date"] = datetime.strptime(row["date"], "%Y-%m-%d %H.%M.%S").date()
-
-    def convert_to_float(val):
-        if isinstance(val, str):
-            return float(val.replace(",", "."))
-        return val
-
-    for entry in data:
-        for key in ["open_value", "high_value", "low_value", "close_value"]:
-            entry[key] = convert_to_float(entry[key])
-        # Optionally convert volume to int if needed
-        if "volume" in entry:
-            try:
-                entry["volume"] = int(entry["volume"])
-            except ValueError:
-                entry["volume"] = 0
-    logger.info(
-        f"Converted {len(data)} rows of stock market data to dictionary format."
-    )
+    df = google_finance_data_to_df(index_data)
+    df["date"] = df["date"].dt.date
+    return df.to_dict(orient="records")
+
+
+def read_google_finance_csv(path, chunksize=100000):
+    """
+    Streams a Google Finance history CSV (same layout as the Google Sheet output,
+    e.g. input_data/historisk_aktie_data_omxspi.csv) in typed chunks.
 
-    return data
+    Prices use decimal commas and are parsed by the CSV reader with
+    decimal=","; timestamps are parsed with one vectorized call using the fixed
+    'YYYY-MM-DD HH.MM.SS' format, and bad volume values become 0.
+
+    Args:
+        path (str): Path to the CSV file.
+        chunksize (int): Rows per chunk.
+    Yields:
+        pd.DataFrame: Chunks with 'ticker_id', 'date' (datetime64, midnight as in
+        google_finance_data_to_df), 'open_value', 'high_value', 'low_value',
+        'close_value' and 'volume' columns.
+    """
+    reader = pd.read_csv(
+        path,
+        decimal=",",
+        usecols=list(GOOGLE_FINANCE_CSV_COLUMNS),
+        dtype={"Ticker_id": str, "Date": str, "Volume": str},
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        chunk = chunk.rename(columns=GOOGLE_FINANCE_CSV_COLUMNS)
+        chunk["date"] = pd.to_datetime(
+            chunk["date"], format=GOOGLE_FINANCE_DATE_FORMAT
+        ).dt.normalize()
+        chunk["volume"] = _volume_to_int(chunk["volume"])
+        logger.info(f"Read {len(chunk)} rows of stock market data from {path}")
+        yield chunk
@@ -8,30 +8,48 @@ setup_logging(level=logging.INFO)
 
 import configparser
 
-import pandas as pd
-
 
 from economic_data.extract.economic_data import (
+    fetch_concurrently,
     fetch_ecb_json,
     fetch_eurostat_json,
     fetch_fred_json,
-    get_historical_stock_data,
+    get_historical_stock_data_many,
+    incremental_from_date,
+    incremental_start_dates,
+)
+from economic_data.extract.http_client import configure_http_client
+from economic_data.extract.response_cache import (
+    DEFAULT_CACHE_PATH,
+    ResponseCache,
+    set_response_cache,
 )
 from economic_data.transform.transform_economic_data import (
-    calculate_monthly_change,
     ecb_json_to_df,
     eurostat_json_to_df,
     fred_json_to_df,
+    concat_panel,
     label_and_append,
     set_monthly_ecb_interest_rate,
     rename_economic_indicators,
-    threshold_csv_to_df,
+    load_threshold_rules,
     load_thresholds,
+    TRANSFORM_VERSION,
+)
+from economic_data.transform.transform_cache import (
+    DEFAULT_TRANSFORM_CACHE_DIR,
+    TransformCache,
+    get_transform_cache,
+    memoize_transform,
+    payload_fingerprint,
+    set_transform_cache,
 )
 
+from economic_data.transform.derived_series import Derivation, append_derived_series
 from economic_data.transform.transform_stockmarket_data import (
     convert_google_finance_index_to_dict,
-    convert_google_finance_data_to_dict,
+    google_finance_data_to_df,
+    TRANSFORM_VERSION as STOCK_TRANSFORM_VERSION,
 )
 from economic_data.transform.transform_economic_data import (
     convert_eurostat_infl_ind_to_dict,
@@ -40,6 +58,17 @@ from economic_data.transform.transform_economic_data import (
     # convert_eurostat_gdp_to_dict,
 )
 
+from economic_data.db.session import get_db_url
+from economic_data.load.load_data import (
+    get_indicator_frame,
+    get_latest_indicator_dates,
+    get_latest_stock_dates,
+)
+from economic_data.load.parquet_archive import (
+    DEFAULT_ARCHIVE_DIR,
+    sync_indicator_archive,
+    sync_stock_archive,
+)
 from economic_data.load.save_data import (
     save_stock_index,
     save_stock_data,
@@ -60,71 +89,266 @@ TO_DATE = config["DATE_RANGE"]["TO_DATE"]
 THRESHOLD_FILE = config["FILES"]["ECONOMIC_THRESHOLDS"]
 SERVICE_ACCOUNT_FILE = config["GOOGLE_HISTORICAL_DATA"]["API_KEY_FILE"]
 SPREADSHEET_ID = config["GOOGLE_HISTORICAL_DATA"]["ID"]
+STOCK_SYMBOLS = [
+    s.strip()
+    for s in config.get(
+        "GOOGLE_HISTORICAL_DATA", "SYMBOLS", fallback="INDEXNASDAQ:OMXSPI"
+    ).split(",")
+    if s.strip()
+]
+# comma separated control:output worksheet pairs, one worker per pair
+STOCK_WORKER_SHEETS = [
+    tuple(pair.strip().split(":"))
+    for pair in config.get(
+        "GOOGLE_HISTORICAL_DATA", "WORKER_SHEETS", fallback="Data:output"
+    ).split(",")
+    if pair.strip()
+]
+SHEETS_REQUESTS_PER_MINUTE = config.getint(
+    "GOOGLE_HISTORICAL_DATA", "REQUESTS_PER_MINUTE", fallback=60
+)
+# series derived from stored indicators, keyed by the source indicator label
+DERIVED_SERIES = {
+    "US CPI": [Derivation("mom", "US CPI (Monthly Rate of Change)", "Percent")],
+}
+# all-items HICP, prc_hicp_mmor holds one series per COICOP category
+HICP_SELECTION = {"coicop": "CP00"}
+# name and description of known indices, other symbols are stored under the ticker
+STOCK_INDEX_NAMES = {"INDEXNASDAQ:OMXSPI": ("omx_smi", "stokcholms index")}
+EXTRACT_MAX_WORKERS = config.getint("EXTRACT", "MAX_WORKERS", fallback=6)
+INCREMENTAL = config.getboolean("EXTRACT", "INCREMENTAL", fallback=False)
+INCREMENTAL_OVERLAP_DAYS = config.getint("EXTRACT", "OVERLAP_DAYS", fallback=62)
+# stock rows are daily, so a few days cover the last (possibly intraday) rows
+STOCK_OVERLAP_DAYS = config.getint("EXTRACT", "STOCK_OVERLAP_DAYS", fallback=5)
+# dtype of the value column of the final panel, "float32" halves its size
+PANEL_VALUE_DTYPE = config.get("TRANSFORM", "VALUE_DTYPE", fallback="float64")
+ARCHIVE_ENABLED = config.getboolean("ARCHIVE", "ENABLED", fallback=False)
+ARCHIVE_DIR = config.get("ARCHIVE", "PATH", fallback=DEFAULT_ARCHIVE_DIR)
+
+configure_http_client(
+    connect_timeout=config.getfloat("HTTP", "CONNECT_TIMEOUT", fallback=5.0),
+    read_timeout=config.getfloat("HTTP", "READ_TIMEOUT", fallback=30.0),
+    max_retries=config.getint("HTTP", "MAX_RETRIES", fallback=5),
+    pool_maxsize=config.getint("HTTP", "POOL_MAXSIZE", fallback=4),
+)
+if config.getboolean("CACHE", "ENABLED", fallback=False):
+    set_response_cache(
+        ResponseCache(
+            config.get("CACHE", "PATH", fallback=DEFAULT_CACHE_PATH),
+            ttl_seconds=config.getfloat("CACHE", "TTL_DAYS", fallback=30) * 24 * 3600,
+            max_bytes=config.getint("CACHE", "MAX_MB", fallback=512) * 1024 * 1024,
+            offline=config.getboolean("CACHE", "OFFLINE", fallback=False),
+        )
+    )
+if config.getboolean("TRANSFORM", "CACHE_ENABLED", fallback=False):
+    set_transform_cache(
+        TransformCache(
+            config.get("TRANSFORM", "CACHE_PATH", fallback=DEFAULT_TRANSFORM_CACHE_DIR),
+            max_bytes=config.getint("TRANSFORM", "CACHE_MAX_MB", fallback=1024)
+            * 1024
+            * 1024,
+        )
+    )
+
+
+def already_loaded(name, payload, stored_dates):
+    """
+    Returns True if `payload` is unchanged since it was last loaded into the
+    database for series `name`, according to the transform cache markers.
+    The series must also still have rows in `stored_dates` (see
+    get_latest_indicator_dates), so a reset or replaced database is reloaded.
+    """
+    cache = get_transform_cache()
+    return (
+        cache is not None
+        and name in stored_dates
+        and cache.is_loaded(f"{get_db_url()}:{name}", payload_fingerprint(payload))
+    )
+
+
+def mark_loaded(name, payload):
+    cache = get_transform_cache()
+    if cache is not None:
+        cache.mark_loaded(f"{get_db_url()}:{name}", payload_fingerprint(payload))
+
+
+def fetch_stock_histories(start_dates):
+    """Fetches all configured symbols, returning a dict of symbol -> sheet rows."""
+    return dict(
+        get_historical_stock_data_many(
+            STOCK_SYMBOLS,
+            SERVICE_ACCOUNT_FILE,
+            SPREADSHEET_ID,
+            start_dates,
+            worker_sheets=STOCK_WORKER_SHEETS,
+            requests_per_minute=SHEETS_REQUESTS_PER_MINUTE,
+        )
+    )
 
 
 def main():
     logger.info("Starting economic data extraction and transformation...")
 
-    # Extract - economic indicators
-    inflation_euro_json = fetch_eurostat_json("prc_hicp_mmor", FROM_DATE)
-    eurostat_unemployment_json = fetch_eurostat_json("ei_lmhr_m", FROM_DATE)
-    ecb_interest_json = fetch_ecb_json(
-        "FM", "B.U2.EUR.4F.KR.MRR_FR.LEV", FROM_DATE, TO_DATE
-    )
-    fred_unemployment_json = fetch_fred_json("UNRATE", API_KEY_FRED, FROM_DATE, TO_DATE)
-    fred_cpi_json = fetch_fred_json("CPIAUCSL", API_KEY_FRED, FROM_DATE, TO_DATE)
-    fred_fedfunds_json = fetch_fred_json("DFF", API_KEY_FRED, FROM_DATE, TO_DATE)
-
-    # Extract - Stocks and Indices
-    omx_smi_dict = get_historical_stock_data(
-        "INDEXNASDAQ:OMXSPI",
-        SERVICE_ACCOUNT_FILE,
-        SPREADSHEET_ID,
+    # In incremental mode only the window after the latest stored date is fetched
+    latest_dates = get_latest_indicator_dates() if INCREMENTAL else {}
+    inflation_euro_from_date = incremental_from_date(
+        FROM_DATE,
+        latest_dates.get("inflation_monthly_euro"),
+        INCREMENTAL_OVERLAP_DAYS,
+    )
+    stock_start_dates = incremental_start_dates(
+        STOCK_SYMBOLS,
         FROM_DATE,
+        get_latest_stock_dates() if INCREMENTAL else {},
+        STOCK_OVERLAP_DAYS,
+    )
+
+    # Extract - economic indicators and stocks, all sources run concurrently
+    payloads = fetch_concurrently(
+        {
+            "prc_hicp_mmor": (
+                fetch_eurostat_json,
+                ("prc_hicp_mmor", inflation_euro_from_date),
+                {"filters": HICP_SELECTION},
+            ),
+            "ei_lmhr_m": (
+                fetch_eurostat_json,
+                ("ei_lmhr_m", FROM_DATE),
+                # total unemployment, seasonally adjusted, % of active population
+                {
+                    "filters": {
+                        "indic": "LM-UN-T-TOT",
+                        "s_adj": "SA",
+                        "unit": "PC_ACT",
+                    }
+                },
+            ),
+            "ecb_mrr": (
+                fetch_ecb_json,
+                ("FM", "B.U2.EUR.4F.KR.MRR_FR.LEV", FROM_DATE, TO_DATE),
+            ),
+            "UNRATE": (fetch_fred_json, ("UNRATE", API_KEY_FRED, FROM_DATE, TO_DATE)),
+            "CPIAUCSL": (
+                fetch_fred_json,
+                ("CPIAUCSL", API_KEY_FRED, FROM_DATE, TO_DATE),
+            ),
+            "DFF": (fetch_fred_json, ("DFF", API_KEY_FRED, FROM_DATE, TO_DATE)),
+            "stocks": (fetch_stock_histories, (stock_start_dates,)),
+        },
+        max_workers=EXTRACT_MAX_WORKERS,
     )
+    inflation_euro_json = payloads["prc_hicp_mmor"]
+    eurostat_unemployment_json = payloads["ei_lmhr_m"]
+    ecb_interest_json = payloads["ecb_mrr"]
+    fred_unemployment_json = payloads["UNRATE"]
+    fred_cpi_json = payloads["CPIAUCSL"]
+    fred_fedfunds_json = payloads["DFF"]
+    stock_histories = payloads["stocks"] or {}
 
     # Transform - Economic Indicators
     # TODO: Döp om alla namn på formatet <KPI><Region><typ av data>
     # T ex inflation_euro_indicator_id
-    inflation_euro_df = eurostat_json_to_df(inflation_euro_json, "prc_hicp_mmor")
-    inflation_euro_indicator = convert_eurostat_infl_ind_to_dict(
+    # Unchanged payloads reuse their memoized output when the transform cache is on
+    inflation_euro_df = memoize_transform(
+        eurostat_json_to_df,
         inflation_euro_json,
-        "inflation_monthly_euro",
-        "Monthly inflation rate in EURO area",
-    )
-    inflation_euro_data = convert_eurostat_infl_data_to_dict(
-        inflation_euro_json, "prc_hicp_mmor"
+        "prc_hicp_mmor",
+        selection=HICP_SELECTION,
+        version=TRANSFORM_VERSION,
     )
 
     # inflation_euro_df = rename_economic_indicators(
     #     inflation_euro_df
     # )  # TODO: Denna ska nog tas bort
     # NEXT: Fixa resten av indicators
-    unemployment_euro_df = eurostat_json_to_df(eurostat_unemployment_json, "ei_lmhr_m")
-    ecb_interest_rate_df = ecb_json_to_df(
-        ecb_interest_json, "FM", "B.U2.EUR.4F.KR.MRR_FR.LEV"
+    unemployment_euro_df = memoize_transform(
+        eurostat_json_to_df,
+        eurostat_unemployment_json,
+        "ei_lmhr_m",
+        version=TRANSFORM_VERSION,
     )
-    us_unemployment_df = fred_json_to_df(fred_unemployment_json, FROM_DATE)
-    us_cpi_df = fred_json_to_df(fred_cpi_json, FROM_DATE)
-    us_fed_funds_rate_df = fred_json_to_df(fred_fedfunds_json, FROM_DATE)
-    thresholds_df = threshold_csv_to_df(THRESHOLD_FILE)
-
-    # Transform - Stocks and Indices
-    index_omx = convert_google_finance_index_to_dict(
-        omx_smi_dict, "omx_smi", "stokcholms index", "google spreadsheet"
+    ecb_interest_rate_df = memoize_transform(
+        ecb_json_to_df,
+        ecb_interest_json,
+        "FM",
+        "B.U2.EUR.4F.KR.MRR_FR.LEV",
+        version=TRANSFORM_VERSION,
     )
-
-    data_omx = convert_google_finance_data_to_dict(omx_smi_dict)
-
-    # Load - Save stock data
-    index_omx_id = save_stock_index(
-        index_omx,
+    us_unemployment_df = memoize_transform(
+        fred_json_to_df, fred_unemployment_json, FROM_DATE, version=TRANSFORM_VERSION
+    )
+    us_cpi_df = memoize_transform(
+        fred_json_to_df, fred_cpi_json, FROM_DATE, version=TRANSFORM_VERSION
     )
-    save_stock_data(index_omx_id, data_omx)
+    us_fed_funds_rate_df = memoize_transform(
+        fred_json_to_df, fred_fedfunds_json, FROM_DATE, version=TRANSFORM_VERSION
+    )
+    threshold_rules = load_threshold_rules(THRESHOLD_FILE)
+
+    # Series with stored rows, only needed to check the transform cache markers
+    caching = get_transform_cache() is not None
+    stored_stock_dates = get_latest_stock_dates() if caching else {}
+    stored_indicator_dates = get_latest_indicator_dates() if caching else {}
+
+    # Transform and Load - Stocks and Indices
+    for symbol, stock_data in stock_histories.items():
+        if len(stock_data) < 2:
+            logger.warning(f"No stock data returned for {symbol}")
+            continue
+        if already_loaded(symbol, stock_data, stored_stock_dates):
+            logger.info(f"Stock data for {symbol} unchanged since last load, skipping")
+            continue
+        name, description = STOCK_INDEX_NAMES.get(symbol, (symbol, symbol))
+        stock_index = convert_google_finance_index_to_dict(
+            stock_data, name, description, "google spreadsheet"
+        )
+        stock_index_id = save_stock_index(stock_index)
+        # overlapping rows are overwritten, the last stored day may be intraday
+        save_stock_data(
+            stock_index_id,
+            memoize_transform(
+                google_finance_data_to_df,
+                stock_data,
+                version=STOCK_TRANSFORM_VERSION,
+            ),
+            on_conflict="update" if INCREMENTAL else "ignore",
+        )
+        mark_loaded(symbol, stock_data)
 
     # Load - Save economic indicator data
-    inflation_euro_indicator_id = save_indicator(inflation_euro_indicator)
-    save_indicator_data(inflation_euro_indicator_id, inflation_euro_data)
+    inflation_euro_indicator_id = None
+    if inflation_euro_json is not None:
+        inflation_euro_indicator = convert_eurostat_infl_ind_to_dict(
+            inflation_euro_json,
+            "inflation_monthly_euro",
+            "Monthly inflation rate in EURO area",
+        )
+        inflation_euro_indicator_id = save_indicator(inflation_euro_indicator)
+        if already_loaded(
+            "inflation_monthly_euro", inflation_euro_json, stored_indicator_dates
+        ):
+            logger.info("Eurozone HICP unchanged since last load, skipping")
+        else:
+            inflation_euro_data = convert_eurostat_infl_data_to_dict(
+                inflation_euro_json, "prc_hicp_mmor", HICP_SELECTION
+            )
+            # revisions inside the incremental overlap overwrite stored values
+            save_indicator_data(
+                inflation_euro_indicator_id,
+                inflation_euro_data,
+                on_conflict="update" if INCREMENTAL else "ignore",
+            )
+            mark_loaded("inflation_monthly_euro", inflation_euro_json)
+
+    # The incremental payload only covers the latest months, so the panel
+    # reads the full stored history instead
+    if INCREMENTAL and inflation_euro_indicator_id is not None:
+        inflation_euro_df = get_indicator_frame(inflation_euro_indicator_id)
+
+    # Load - Mirror newly stored rows into the Parquet archive
+    if ARCHIVE_ENABLED:
+        sync_indicator_archive(ARCHIVE_DIR)
+        sync_stock_archive(ARCHIVE_DIR)
 
     # -------------------
 
@@ -154,7 +378,7 @@ def main():
 
     # add ECB interest rate with monthly frequency
     ecb_monthly_interest_rate_df = set_monthly_ecb_interest_rate(
-        ecb_interest_rate_df, FROM_DATE
+        ecb_interest_rate_df, FROM_DATE, TO_DATE or None
     )
     label_and_append(
         ecb_monthly_interest_rate_df,
@@ -171,30 +395,22 @@ def main():
         us_fed_funds_rate_df, "US Federal Funds Rate", "FRED", "Percent", dfs_to_merge
     )
 
-    # Calculate monthly change for US CPI
-    us_cpi_monthly_change_df = calculate_monthly_change(us_cpi_df, "US CPI")
-    label_and_append(
-        us_cpi_monthly_change_df,
-        "US CPI (Monthly Rate of Change)",
-        "FRED",
-        "Percent",
-        dfs_to_merge,
-    )
-
     if dfs_to_merge:
-        final_df = pd.concat(dfs_to_merge, ignore_index=True)
+        final_df = concat_panel(dfs_to_merge, value_dtype=PANEL_VALUE_DTYPE)
+        # derived series, e.g. the monthly change of US CPI
+        final_df = append_derived_series(final_df, DERIVED_SERIES)
         # rename indicators for clarity
         final_df = rename_economic_indicators(final_df)
         logger.info(
             f"Data extraction and transformation completed successfully with final df shape {final_df.shape}."
         )
-        logger.info(final_df.groupby("indicator").size())
+        logger.info(final_df.groupby("indicator", observed=True).size())
 
     else:
         logger.info("No data to show.")
 
     # Load thresholds
-    final_df = load_thresholds(final_df, thresholds_df)
+    final_df = load_thresholds(final_df, threshold_rules)
     # final_df.to_excel(
     #     "tmp_output/economic_data_summary.xlsx",
     #     index=False,